@@ -0,0 +1,95 @@
+import argparse
+import sys
+import time
+
+from aoc.cache import clear_cache
+from aoc.importtime import measure_startup, format_startup
+from aoc.profiling import PROFILE_KINDS, CPU_SORT_KEYS, format_profiles
+from aoc.runner import parse_days, run_days, format_report, format_duration
+from aoc.pool import run_days_parallel, record_timings
+
+
+def add_run_parser(subparsers):
+    run_parser = subparsers.add_parser('run', help='run days and report per-part timings')
+    run_parser.add_argument('days', nargs='?', default='1-24', help="days to run, e.g. '1-24' or '1,3,5-7'")
+    run_parser.add_argument('--parts', default='1,2', help="parts to run, e.g. '1' or '1,2'")
+    run_parser.add_argument('--no-memory', action='store_true',
+                            help='skip tracemalloc peak memory tracking, which slows down the days')
+    run_parser.add_argument('--verbose', action='store_true', help='show the output the days print themselves')
+    run_parser.add_argument('-j', '--jobs', type=int, default=1,
+                            help='number of worker processes, 0 for one per cpu (default: 1, no pool)')
+    run_parser.add_argument('--split-parts', action='store_true',
+                            help='schedule the parts of a day as separate tasks in the process pool')
+    run_parser.add_argument('--no-cache', action='store_true',
+                            help='recompute all answers instead of reusing cached ones, and refresh the cache')
+    run_parser.add_argument('--profile', choices=PROFILE_KINDS, default=None,
+                            help='profile the parse and parts with cProfile (cpu) or tracemalloc (mem), writing '
+                                 'the stats to .aoc/profiles. implies --no-cache and --no-memory')
+    run_parser.add_argument('--profile-top', type=int, default=15,
+                            help='number of functions or allocation sites to list per profile')
+    run_parser.add_argument('--profile-sort', choices=CPU_SORT_KEYS, default='tottime',
+                            help='how to order the functions of cpu profiles')
+
+
+def add_clear_cache_parser(subparsers):
+    subparsers.add_parser('clear-cache', help='remove all cached answers')
+
+
+def add_importtime_parser(subparsers):
+    importtime_parser = subparsers.add_parser('importtime',
+                                              help='report the import time of days in a fresh interpreter')
+    importtime_parser.add_argument('days', nargs='?', default='1-24', help="days to measure, e.g. '1-24'")
+    importtime_parser.add_argument('--repeats', type=int, default=5, help='fresh interpreters per day')
+    importtime_parser.add_argument('--top', type=int, default=3, help='number of heaviest imports to list')
+    importtime_parser.add_argument('--budget', type=float, default=None,
+                                   help='import time budget per day in ms, exits with 1 when a day exceeds it')
+
+
+def run_command(args):
+    parts = [int(part) for part in args.parts.split(',')]
+    days = parse_days(args.days)
+    # a cached part has nothing to profile, and tracking peak memory would skew both kinds of profile
+    use_cache = not args.no_cache and args.profile is None
+    measure_memory = not args.no_memory and args.profile is None
+    start = time.perf_counter()
+    if args.jobs == 1 and not args.split_parts:
+        results = run_days(days, parts, measure_memory=measure_memory, quiet=not args.verbose,
+                           use_cache=use_cache, profile=args.profile)
+    else:
+        results = run_days_parallel(days, parts, jobs=args.jobs, split_parts=args.split_parts,
+                                    measure_memory=measure_memory, quiet=not args.verbose,
+                                    use_cache=use_cache, profile=args.profile)
+    wall_time = time.perf_counter() - start
+    if args.profile is None:  # profiled timings are inflated, they would mess up the pool's schedule
+        record_timings(results)
+    print(format_report(results))
+    print(f'wall clock: {format_duration(wall_time)}')
+    if args.profile is not None:
+        print(format_profiles(results, args.profile, top=args.profile_top, sort_key=args.profile_sort))
+
+
+def importtime_command(args):
+    budget = None if args.budget is None else args.budget / 1e3
+    startups = [measure_startup(day, repeats=args.repeats) for day in parse_days(args.days)]
+    print(format_startup(startups, budget=budget, top=args.top))
+    if budget is not None and any((startup.import_time() > budget for startup in startups)):
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m aoc')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    add_run_parser(subparsers)
+    add_clear_cache_parser(subparsers)
+    add_importtime_parser(subparsers)
+    args = parser.parse_args()
+    if args.command == 'run':
+        run_command(args)
+    elif args.command == 'clear-cache':
+        print(f'removed {clear_cache()} cached answers')
+    elif args.command == 'importtime':
+        importtime_command(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+from typing import Any, List, Optional
+from pathlib import Path
+import ast
+import hashlib
+import json
+import os
+
+from aoc.paths import ROOT, STATE_DIR
+
+
+CACHE_DIR = STATE_DIR / 'cache'
+
+MISSING = object()
+
+
+def local_module_paths(name: str) -> List[Path]:
+    module_path = ROOT / f'{name}.py'
+    if module_path.exists():
+        return [module_path]
+    package_path = ROOT / name
+    if (package_path / '__init__.py').exists():
+        return sorted(package_path.rglob('*.py'))
+    return []
+
+
+def imported_names(path: Path) -> List[str]:
+    names = []
+    for node in ast.walk(ast.parse(path.read_text())):
+        if isinstance(node, ast.Import):
+            names.extend((alias.name.split('.')[0] for alias in node.names))
+        elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            names.append(node.module.split('.')[0])
+    return names
+
+
+def source_paths(module_name: str) -> List[Path]:
+    # the module itself and every module from this repository it imports, directly or not. that way
+    # a change to the shared graph module also invalidates the days that use it
+    todo = [module_name]
+    seen = set()
+    paths = []
+    while todo:
+        name = todo.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        for path in local_module_paths(name):
+            paths.append(path)
+            todo.extend(imported_names(path))
+    return sorted(set(paths))
+
+
+def code_hash(module_name: str) -> str:
+    digest = hashlib.sha256()
+    for path in source_paths(module_name):
+        digest.update(str(path.relative_to(ROOT)).encode())
+        digest.update(b'\0')
+        digest.update(path.read_bytes())
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def input_hash(the_input: str) -> str:
+    return hashlib.sha256(the_input.encode()).hexdigest()
+
+
+def cache_key(day: int, part: int, code_digest: str, input_digest: str) -> str:
+    return hashlib.sha256(f'{day}:{part}:{code_digest}:{input_digest}'.encode()).hexdigest()
+
+
+def cache_path(key: str) -> Path:
+    return CACHE_DIR / f'{key}.json'
+
+
+def load_answer(key: str) -> Any:
+    path = cache_path(key)
+    if not path.exists():
+        return MISSING
+    with open(path) as f:
+        return json.load(f)['answer']
+
+
+def store_answer(key: str, day: int, part: int, answer: Any, part_time: Optional[float] = None):
+    try:
+        entry = json.dumps({'day': day, 'part': part, 'answer': answer, 'time': part_time})
+    except TypeError:  # answers that json can not represent are simply not cached
+        return
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    # write and rename, so a worker process reading at the same time never sees half an entry
+    tmp_path = CACHE_DIR / f'{key}.{os.getpid()}.tmp'
+    tmp_path.write_text(entry)
+    tmp_path.replace(cache_path(key))
+
+
+def clear_cache() -> int:
+    if not CACHE_DIR.exists():
+        return 0
+    paths = list(CACHE_DIR.glob('*.json'))
+    for path in paths:
+        path.unlink()
+    return len(paths)
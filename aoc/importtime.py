@@ -0,0 +1,97 @@
+from typing import List, Optional, Sequence
+import statistics
+import subprocess
+import sys
+import time
+
+from attrs import define, Factory
+
+from aoc.paths import ROOT
+from aoc.runner import format_duration
+
+
+@define
+class ImportTime:
+    name: str
+    self_time: float  # in seconds, like everything else in the reports
+    cumulative_time: float
+    depth: int
+
+
+@define
+class StartupTime:
+    day: int
+    process_times: List[float] = Factory(list)  # wall clock of a whole `python -c 'import dayNN'`
+    import_times: List[float] = Factory(list)  # what -X importtime reports for dayNN itself
+    self_times: List[float] = Factory(list)  # the part of that spent running the module body of dayNN
+    imports: List[ImportTime] = Factory(list)  # everything dayNN pulled in, from the last run
+
+    def process_time(self) -> float:
+        return statistics.median(self.process_times)
+
+    def import_time(self) -> float:
+        return statistics.median(self.import_times)
+
+    def self_time(self) -> float:
+        return statistics.median(self.self_times)
+
+
+def parse_importtime(stderr: str) -> List[ImportTime]:
+    # lines look like 'import time:       374 |      54038 |   attrs', nesting shown by indentation
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        if not self_us.strip().isdigit():  # the header line
+            continue
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        imports.append(ImportTime(name.strip(), int(self_us) / 1e6, int(cumulative_us) / 1e6, depth))
+    return imports
+
+
+def module_imports(imports: List[ImportTime], module_name: str) -> List[ImportTime]:
+    # a module is listed after everything it imports, so its imports are the deeper lines right before it.
+    # the module itself comes last
+    end = next((i for i, imp in enumerate(imports) if imp.name == module_name and imp.depth == 0))
+    start = end
+    while start > 0 and imports[start - 1].depth > 0:
+        start -= 1
+    return imports[start:end + 1]
+
+
+def measure_startup(day: int, repeats: int = 5) -> StartupTime:
+    # every run is a fresh interpreter, so nothing is imported yet besides what site pulls in
+    module_name = f'day{day:02d}'
+    result = StartupTime(day)
+    for _ in range(repeats):
+        start = time.perf_counter()
+        process = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module_name}'],
+                                 cwd=ROOT, capture_output=True, text=True)
+        result.process_times.append(time.perf_counter() - start)
+        if process.returncode != 0:
+            raise RuntimeError(f'importing {module_name} failed: {process.stderr.strip().splitlines()[-1]}')
+        result.imports = module_imports(parse_importtime(process.stderr), module_name)
+        result.import_times.append(result.imports[-1].cumulative_time)
+        result.self_times.append(result.imports[-1].self_time)
+    return result
+
+
+def heaviest_imports(startup: StartupTime, top: int) -> List[ImportTime]:
+    # the direct imports of the day, the nested ones are already part of their cumulative time
+    children = [imp for imp in startup.imports if imp.depth == 1]
+    return sorted(children, key=lambda imp: -imp.cumulative_time)[:top]
+
+
+def format_startup(startups: Sequence[StartupTime], budget: Optional[float] = None, top: int = 3) -> str:
+    lines = [f'{"day":>3}  {"process":>9}  {"import":>9}  {"self":>9}  heaviest imports']
+    for startup in startups:
+        heaviest = ', '.join((f'{imp.name} {format_duration(imp.cumulative_time)}'
+                              for imp in heaviest_imports(startup, top)))
+        over = '  OVER BUDGET' if budget is not None and startup.import_time() > budget else ''
+        lines.append(f'{startup.day:>3}  {format_duration(startup.process_time()):>9}  '
+                     f'{format_duration(startup.import_time()):>9}  {format_duration(startup.self_time()):>9}  '
+                     f'{heaviest}{over}')
+    lines.append(f'{"all":>3}  {format_duration(sum((s.process_time() for s in startups))):>9}  '
+                 f'{format_duration(sum((s.import_time() for s in startups))):>9}')
+    return '\n'.join(lines)
@@ -0,0 +1,10 @@
+from pathlib import Path
+import sys
+
+
+ROOT = Path(__file__).resolve().parent.parent
+INPUT_DIR = ROOT / 'input'
+STATE_DIR = ROOT / '.aoc'  # timings, cached answers and other local state, not under version control
+
+if str(ROOT) not in sys.path:  # the day modules and their shared helpers live next to this package, not inside it
+    sys.path.insert(0, str(ROOT))
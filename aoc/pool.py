@@ -0,0 +1,104 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import json
+import os
+
+from aoc.paths import STATE_DIR
+from aoc.runner import ALL_PARTS, DayResult, run_day
+
+
+TIMINGS_PATH = STATE_DIR / 'timings.json'
+
+Task = Tuple[int, Tuple[int, ...]]
+Timings = Dict[str, Dict[str, float]]
+
+
+def load_timings() -> Timings:
+    if not TIMINGS_PATH.exists():
+        return {}
+    with open(TIMINGS_PATH) as f:
+        return json.load(f)
+
+
+def save_timings(timings: Timings):
+    STATE_DIR.mkdir(exist_ok=True)
+    with open(TIMINGS_PATH, 'w') as f:
+        json.dump(timings, f, indent=2, sort_keys=True)
+
+
+def record_timings(results: List[DayResult]):
+    # only successful measurements are kept, a crashing part says nothing about how long it takes
+    timings = load_timings()
+    for result in results:
+        if result.error is not None:
+            continue
+        if not result.part_times:  # everything came from the cache, nothing was measured
+            continue
+        day_timings = timings.setdefault(str(result.day), {})
+        day_timings['parse'] = result.parse_time
+        for part, part_time in result.part_times.items():
+            day_timings[str(part)] = part_time
+    save_timings(timings)
+
+
+def expected_time(timings: Timings, task: Task) -> Optional[float]:
+    day, parts = task
+    day_timings = timings.get(str(day), {})
+    if 'parse' not in day_timings or any((str(part) not in day_timings for part in parts)):
+        return None
+    return day_timings['parse'] + sum((day_timings[str(part)] for part in parts))
+
+
+def schedule(tasks: List[Task], timings: Timings) -> List[Task]:
+    # longest expected first, so the long days do not end up starting last. tasks we have never
+    # seen could be anything, so they go up front as well
+    def sort_key(task: Task):
+        expected = expected_time(timings, task)
+        return (0, 0) if expected is None else (1, -expected)
+    return sorted(tasks, key=sort_key)
+
+
+def make_tasks(days: Sequence[int], parts: Sequence[int], split_parts: bool) -> List[Task]:
+    if split_parts:
+        return [(day, (part,)) for day in days for part in parts]
+    return [(day, tuple(parts)) for day in days]
+
+
+def merge_results(results: List[DayResult]) -> List[DayResult]:
+    # when parts ran as separate tasks, each task parsed the input itself; report the slowest parse
+    merged: Dict[int, DayResult] = {}
+    for result in results:
+        if result.day not in merged:
+            merged[result.day] = result
+            continue
+        into = merged[result.day]
+        into.parse_time = max(into.parse_time, result.parse_time)
+        into.part_times.update(result.part_times)
+        into.answers.update(result.answers)
+        if result.peak_memory is not None:
+            into.peak_memory = max(into.peak_memory or 0, result.peak_memory)
+        if into.error is None:
+            into.error = result.error
+        into.cached_parts.extend(result.cached_parts)
+        into.profiles.update(result.profiles)
+    for result in merged.values():
+        result.part_times = dict(sorted(result.part_times.items()))
+        result.answers = dict(sorted(result.answers.items()))
+    return [merged[day] for day in sorted(merged)]
+
+
+def run_days_parallel(days: Sequence[int], parts: Sequence[int] = ALL_PARTS, jobs: int = 0,
+                      split_parts=False, measure_memory=True, quiet=True, use_cache=True,
+                      profile: Optional[str] = None) -> List[DayResult]:
+    tasks = schedule(make_tasks(days, parts, split_parts), load_timings())
+    results = []
+    # the executor hands out work in submission order, so submitting in schedule order is enough
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count()) as executor:
+        futures = [
+            executor.submit(run_day, day, task_parts, measure_memory=measure_memory, quiet=quiet,
+                            use_cache=use_cache, profile=profile)
+            for day, task_parts in tasks
+        ]
+        for future in as_completed(futures):
+            results.append(future.result())
+    return merge_results(results)
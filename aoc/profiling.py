@@ -0,0 +1,115 @@
+from typing import Any, Callable, List, Tuple
+from pathlib import Path
+import cProfile
+import pstats
+import threading
+import tracemalloc
+
+from aoc.paths import ROOT, STATE_DIR
+
+
+PROFILE_DIR = STATE_DIR / 'profiles'
+PROFILE_KINDS = ('cpu', 'mem')
+CPU_SORT_KEYS = ('tottime', 'cumtime', 'calls')
+
+
+def profile_path(kind: str, day: int, stage: str) -> Path:
+    suffix = 'prof' if kind == 'cpu' else 'snapshot'
+    return PROFILE_DIR / f'day{day:02d}_{stage}.{suffix}'
+
+
+class PeakSnapshots(threading.Thread):
+    # tracemalloc only knows how large the peak was, not what was allocated at that moment. this polls
+    # the traced size and takes a new snapshot each time it grew well past the last one, so the last
+    # snapshot shows roughly what was alive near the peak
+    def __init__(self, interval=0.05, growth=1.2):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.growth = growth
+        self.snapshot = None
+        self.snapshot_size = 0
+        self.done = threading.Event()
+
+    def take_snapshot(self):
+        size = tracemalloc.get_traced_memory()[0]
+        # leave out what this thread itself allocates
+        self.snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, threading.__file__),
+            tracemalloc.Filter(False, __file__),
+        ])
+        self.snapshot_size = size
+
+    def run(self):
+        while not self.done.wait(self.interval):
+            if tracemalloc.get_traced_memory()[0] > self.snapshot_size * self.growth:
+                self.take_snapshot()
+
+    def stop(self):
+        self.done.set()
+        self.join()
+        if tracemalloc.get_traced_memory()[0] > self.snapshot_size:  # peaked right before the end
+            self.take_snapshot()
+
+
+def profile_call(kind: str, day: int, stage: str, fn: Callable, *args) -> Tuple[Any, Path]:
+    # the profile gets written even when fn raises, it may well show why
+    path = profile_path(kind, day, stage)
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    if kind == 'cpu':
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(fn, *args), path
+        finally:
+            profiler.dump_stats(path)
+    if kind == 'mem':
+        tracemalloc.start()
+        snapshots = PeakSnapshots()
+        snapshots.start()
+        try:
+            return fn(*args), path
+        finally:
+            snapshots.stop()
+            tracemalloc.stop()
+            snapshots.snapshot.dump(str(path))
+    raise ValueError(f'unknown profile kind: {kind}')
+
+
+def short_path(filename: str) -> str:
+    path = Path(filename)
+    return str(path.relative_to(ROOT)) if path.is_relative_to(ROOT) else filename
+
+
+def format_cpu_summary(path: Path, top: int = 15, sort_key: str = 'tottime') -> List[str]:
+    stats = pstats.Stats(str(path)).stats
+    sort_index = {'calls': 1, 'tottime': 2, 'cumtime': 3}[sort_key]
+    rows = sorted(stats.items(), key=lambda item: -item[1][sort_index])[:top]
+    lines = [f'{"calls":>10}  {"tottime":>9}  {"cumtime":>9}  function']
+    for (filename, line, func_name), (_, calls, tottime, cumtime, _) in rows:
+        location = func_name if filename == '~' else f'{short_path(filename)}:{line}({func_name})'
+        lines.append(f'{calls:>10}  {tottime:>8.3f}s  {cumtime:>8.3f}s  {location}')
+    return lines
+
+
+def format_mem_summary(path: Path, top: int = 15) -> List[str]:
+    from aoc.runner import format_bytes  # not at the top, the runner imports this module
+    snapshot = tracemalloc.Snapshot.load(str(path))
+    statistics = snapshot.statistics('lineno')
+    lines = [f'near peak: {format_bytes(sum((stat.size for stat in statistics)))}',
+             f'{"size":>10}  {"blocks":>9}  allocated at']
+    for stat in statistics[:top]:
+        frame = stat.traceback[0]
+        lines.append(f'{format_bytes(stat.size):>10}  {stat.count:>9}  {short_path(frame.filename)}:{frame.lineno}')
+    return lines
+
+
+def format_profiles(results, kind: str, top: int = 15, sort_key: str = 'tottime') -> str:
+    lines = []
+    for result in results:
+        for stage, path in result.profiles.items():
+            lines.append('')
+            lines.append(f'day {result.day} {stage} {kind} profile, written to {short_path(path)}:')
+            if kind == 'cpu':
+                lines.extend(format_cpu_summary(Path(path), top, sort_key))
+            else:
+                lines.extend(format_mem_summary(Path(path), top))
+    return '\n'.join(lines)
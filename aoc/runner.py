@@ -0,0 +1,173 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from contextlib import redirect_stdout
+from pathlib import Path
+import importlib
+import os
+import sys
+import time
+import traceback
+import tracemalloc
+
+from attrs import define, Factory
+
+from aoc.cache import MISSING, code_hash, input_hash, cache_key, load_answer, store_answer
+from aoc.paths import INPUT_DIR
+from aoc.profiling import profile_call
+from loader import read_input as read_input_file
+
+
+ALL_DAYS = list(range(1, 25))
+ALL_PARTS = (1, 2)
+
+
+@define
+class DayResult:
+    day: int
+    parse_time: float = 0.0
+    part_times: Dict[int, float] = Factory(dict)
+    answers: Dict[int, Any] = Factory(dict)
+    peak_memory: Optional[int] = None  # in bytes, None when not measured
+    error: Optional[str] = None
+    cached_parts: List[int] = Factory(list)
+    profiles: Dict[str, str] = Factory(dict)  # stage ('parse', 'part1', ...) to the written profile
+
+    def total_time(self) -> float:
+        return self.parse_time + sum(self.part_times.values())
+
+
+def parse_days(day_spec: str) -> List[int]:
+    # accepts things like '1-24', '3', '1,5,10-12'
+    days = []
+    for part in day_spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            first, last = part.split('-')
+            days.extend(range(int(first), int(last) + 1))
+        else:
+            days.append(int(part))
+    for day in days:
+        if day not in ALL_DAYS:
+            raise ValueError(f'no such day: {day}')
+    return list(dict.fromkeys(days))
+
+
+def load_day(day: int):
+    return importlib.import_module(f'day{day:02d}')
+
+
+def input_path(day: int) -> Path:
+    return INPUT_DIR / f'day{day:02d}_input.txt'
+
+
+def read_input(day: int) -> str:
+    return read_input_file(input_path(day))
+
+
+def timed_call(result: DayResult, stage: str, profile: Optional[str], fn, *args) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    if profile is None:
+        value = fn(*args)
+    else:
+        value, path = profile_call(profile, result.day, stage, fn, *args)
+        result.profiles[stage] = str(path)
+    return value, time.perf_counter() - start
+
+
+def run_day(day: int, parts: Sequence[int] = ALL_PARTS, measure_memory=True, quiet=True, use_cache=True,
+            profile: Optional[str] = None) -> DayResult:
+    # with use_cache=False everything is recomputed, and the cache gets refreshed with the new answers.
+    # profile is 'cpu' or 'mem', and profiles the parse and every part that gets computed
+    result = DayResult(day)
+    if measure_memory:
+        tracemalloc.start()
+    try:
+        # the days print plenty of debug output, which should not end up in between the report
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull if quiet else sys.stdout):
+            the_input = read_input(day)
+            code_digest, input_digest = code_hash(f'day{day:02d}'), input_hash(the_input)
+            keys = {part: cache_key(day, part, code_digest, input_digest) for part in parts}
+            if use_cache:
+                for part in parts:
+                    answer = load_answer(keys[part])
+                    if answer is not MISSING:
+                        result.answers[part] = answer
+                        result.cached_parts.append(part)
+            todo = [part for part in parts if part not in result.cached_parts]
+            if todo:
+                module = load_day(day)
+                parsed, result.parse_time = timed_call(result, 'parse', profile, module.parse, the_input)
+            for part in todo:
+                part_fn = getattr(module, f'part{part}')
+                result.answers[part], result.part_times[part] = timed_call(result, f'part{part}', profile,
+                                                                           part_fn, parsed)
+                store_answer(keys[part], day, part, result.answers[part], result.part_times[part])
+    except Exception:
+        result.error = traceback.format_exc().strip().splitlines()[-1]
+    finally:
+        if measure_memory:
+            result.peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    result.answers = dict(sorted(result.answers.items()))
+    return result
+
+
+def run_days(days: Sequence[int], parts: Sequence[int] = ALL_PARTS, measure_memory=True, quiet=True,
+             use_cache=True, profile: Optional[str] = None) -> List[DayResult]:
+    return [
+        run_day(day, parts, measure_memory=measure_memory, quiet=quiet, use_cache=use_cache, profile=profile)
+        for day in days
+    ]
+
+
+def format_duration(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return '-'
+    if seconds < 1e-3:
+        return f'{seconds * 1e6:.0f} us'
+    if seconds < 1:
+        return f'{seconds * 1e3:.1f} ms'
+    return f'{seconds:.2f} s'
+
+
+def format_bytes(amount: Optional[int]) -> str:
+    if amount is None:
+        return '-'
+    for unit in ('B', 'KiB', 'MiB'):
+        if amount < 1024:
+            return f'{amount:.0f} {unit}' if unit == 'B' else f'{amount:.1f} {unit}'
+        amount /= 1024
+    return f'{amount:.1f} GiB'
+
+
+def format_report(results: List[DayResult]) -> str:
+    lines = [f'{"day":>3}  {"parse":>9}  {"part 1":>9}  {"part 2":>9}  {"total":>9}  {"peak mem":>10}  answers']
+    multi_line = []
+    for result in results:
+        answers = []
+        for part, answer in result.answers.items():
+            if '\n' in str(answer):
+                multi_line.append((result.day, part, str(answer)))
+                answers.append('<see below>')
+            else:
+                answers.append(str(answer))
+        if result.error is not None:
+            answers.append(f'ERROR: {result.error}')
+        part_columns = [
+            'cached' if part in result.cached_parts else format_duration(result.part_times.get(part))
+            for part in ALL_PARTS
+        ]
+        lines.append(
+            f'{result.day:>3}  {format_duration(result.parse_time if result.part_times else None):>9}  '
+            f'{part_columns[0]:>9}  {part_columns[1]:>9}  '
+            f'{format_duration(result.total_time()):>9}  {format_bytes(result.peak_memory):>10}  '
+            f'{", ".join(answers)}'
+        )
+    lines.append(f'{"all":>3}  {"":>9}  {"":>9}  {"":>9}  '
+                 f'{format_duration(sum((result.total_time() for result in results))):>9}')
+    for day, part, answer in multi_line:
+        lines.append('')
+        lines.append(f'day {day} part {part}:')
+        lines.append(answer)
+    return '\n'.join(lines)
@@ -0,0 +1,120 @@
+import argparse
+import sys
+
+from aoc.runner import parse_days
+from bench.generators import generate
+from bench.harness import parse_stages, run_benchmark, format_benchmark
+from bench.parsers import PARSERS, compare_parsers, format_parser_comparison
+from bench.history import (HISTORY_PATH, record_run, load_history, find_key, machine_id, git_commit, run_key,
+                           pooled_measurements, compare_runs)
+
+
+def add_run_parser(subparsers):
+    run_parser = subparsers.add_parser('run', help='benchmark days on generated inputs of growing size')
+    run_parser.add_argument('days', help="days to benchmark, e.g. '12' or '1,3,5-7'")
+    run_parser.add_argument('--scales', default='1,10,100', help='input sizes relative to the real input')
+    run_parser.add_argument('--stages', default='parse,1,2', help="what to time, e.g. 'parse,1,2' or '1'")
+    run_parser.add_argument('--repeats', type=int, default=3, help='timed runs per stage and scale')
+    run_parser.add_argument('--seed', type=int, default=0)
+    run_parser.add_argument('--no-memory', action='store_true', help='skip the extra tracemalloc run')
+    run_parser.add_argument('--no-history', action='store_true',
+                            help='do not append the results to the benchmark history')
+
+
+def add_parsers_parser(subparsers):
+    parsers_parser = subparsers.add_parser('parsers', help='compare parse throughput of the fast and the parsy parsers')
+    parsers_parser.add_argument('days', nargs='?', default=','.join(map(str, PARSERS)),
+                                help=f"days to compare, default: all that have both ({','.join(map(str, PARSERS))})")
+    parsers_parser.add_argument('--scales', default='1,10,100', help='input sizes relative to the real input')
+    parsers_parser.add_argument('--repeats', type=int, default=5, help='timed runs per parser and scale')
+    parsers_parser.add_argument('--seed', type=int, default=0)
+
+
+def add_compare_parser(subparsers):
+    compare_parser = subparsers.add_parser(
+        'compare', help='compare two recorded benchmark runs of this machine and flag regressions')
+    compare_parser.add_argument('baseline', nargs='?', default=None,
+                                help='commit (prefix) to compare against, default: the latest other one recorded')
+    compare_parser.add_argument('candidate', nargs='?', default=None,
+                                help='commit (prefix) to check, default: the current checkout')
+    compare_parser.add_argument('--threshold', type=float, default=10,
+                                help='flag median times more than this many percent slower (default: 10)')
+    compare_parser.add_argument('--memory-threshold', type=float, default=10,
+                                help='flag peak memory more than this many percent larger (default: 10)')
+
+
+def add_generate_parser(subparsers):
+    generate_parser = subparsers.add_parser('generate', help='print a generated input')
+    generate_parser.add_argument('day', type=int)
+    generate_parser.add_argument('--scale', type=int, default=1)
+    generate_parser.add_argument('--seed', type=int, default=0)
+
+
+def run_command(args):
+    scales = [int(scale) for scale in args.scales.split(',')]
+    stages = parse_stages(args.stages)
+    all_measurements = []
+    for day in parse_days(args.days):
+        measurements = run_benchmark(day, scales, stages, repeats=args.repeats, seed=args.seed,
+                                     measure_memory=not args.no_memory)
+        print(format_benchmark(measurements))
+        print()
+        all_measurements.extend(measurements)
+    if not args.no_history:
+        print(f'recorded as {record_run(all_measurements, args.seed)} in {HISTORY_PATH}')
+
+
+def generate_command(args):
+    sys.stdout.write(generate(args.day, args.scale, args.seed))
+
+
+def parsers_command(args):
+    scales = [int(scale) for scale in args.scales.split(',')]
+    measurements = []
+    for day in parse_days(args.days):
+        measurements.extend(compare_parsers(day, scales, repeats=args.repeats, seed=args.seed))
+    print(format_parser_comparison(measurements))
+
+
+def compare_command(args):
+    history = load_history()
+    machine = machine_id()
+    if args.candidate is None:
+        candidate = run_key(git_commit(), machine)
+        if candidate not in history:
+            sys.exit(f'nothing recorded for the current checkout on {machine}, run the benchmark first')
+    else:
+        candidate = find_key(history, machine, args.candidate)
+    baseline = find_key(history, machine, args.baseline, exclude=candidate)
+    if candidate is None or baseline is None:
+        sys.exit(f'no matching runs recorded on {machine}')
+    print(f'baseline: {baseline}')
+    print(f'now:      {candidate}')
+    lines, regressions = compare_runs(pooled_measurements(history[baseline]), pooled_measurements(history[candidate]),
+                                      args.threshold / 100, args.memory_threshold / 100)
+    print('\n'.join(lines))
+    if regressions:
+        print(f'{regressions} regressions')
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m bench')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    add_run_parser(subparsers)
+    add_generate_parser(subparsers)
+    add_compare_parser(subparsers)
+    add_parsers_parser(subparsers)
+    args = parser.parse_args()
+    if args.command == 'run':
+        run_command(args)
+    elif args.command == 'generate':
+        generate_command(args)
+    elif args.command == 'compare':
+        compare_command(args)
+    elif args.command == 'parsers':
+        parsers_command(args)
+
+
+if __name__ == '__main__':
+    main()
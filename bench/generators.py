@@ -0,0 +1,421 @@
+from typing import Callable, Collection, Dict, List, Tuple
+import json
+import random
+import string
+
+
+# every generator produces an input in the same format as input/dayNN_input.txt, with a size of roughly
+# `scale` times the real input. scale 1 is meant to be comparable to the real thing
+
+
+def scaled_side(side: int, scale: int, dims=2) -> int:
+    # side length of a square (or cube) with `scale` times the area (or volume)
+    return max(1, round(side * scale ** (1 / dims)))
+
+
+def gen_day01(rng: random.Random, scale: int) -> str:
+    return '\n\n'.join((
+        '\n'.join((str(rng.randint(1000, 16000)) for _ in range(rng.randint(1, 15))))
+        for _ in range(250 * scale)
+    )) + '\n'
+
+
+def gen_day02(rng: random.Random, scale: int) -> str:
+    return ''.join((f'{rng.choice("ABC")} {rng.choice("XYZ")}\n' for _ in range(2500 * scale)))
+
+
+def gen_rucksack(rng: random.Random, pool: List[str], badge: str) -> str:
+    # the two halves only share `common`, and the badge only ends up in one half
+    pool = pool.copy()
+    rng.shuffle(pool)
+    common, left_pool, right_pool = pool[0], pool[1:len(pool) // 2 + 1], pool[len(pool) // 2 + 1:]
+    half_len = rng.randint(6, 24)
+    left = [common, badge] + [rng.choice(left_pool) for _ in range(half_len - 2)]
+    right = [common] + [rng.choice(right_pool) for _ in range(half_len - 1)]
+    rng.shuffle(left)
+    rng.shuffle(right)
+    return ''.join(left) + ''.join(right) if rng.random() < 0.5 else ''.join(right) + ''.join(left)
+
+
+def gen_day03(rng: random.Random, scale: int) -> str:
+    lines = []
+    for _ in range(100 * scale):
+        letters = list(string.ascii_letters)
+        rng.shuffle(letters)
+        # each elf of the group draws from its own pool, so the badge is the only shared item
+        badge, pools = letters[0], [letters[1 + 17 * i:1 + 17 * (i + 1)] for i in range(3)]
+        lines.extend((gen_rucksack(rng, pool, badge) for pool in pools))
+    return '\n'.join(lines) + '\n'
+
+
+def gen_day04(rng: random.Random, scale: int) -> str:
+    def gen_range():
+        lb = rng.randint(1, 99)
+        return f'{lb}-{rng.randint(lb, 99)}'
+    return ''.join((f'{gen_range()},{gen_range()}\n' for _ in range(1000 * scale)))
+
+
+def gen_day05(rng: random.Random, scale: int) -> str:
+    # more stacks as well as more moves, to exercise the general header parser
+    num_stacks, height = 9 * max(1, round(scale ** 0.5)), 8
+    stacks = [
+        [rng.choice(string.ascii_uppercase) for _ in range(rng.randint(2, height))]
+        for _ in range(num_stacks)
+    ]
+    header = [
+        ' '.join((f'[{stack[row]}]' if row < len(stack) else '   ' for stack in stacks))
+        for row in reversed(range(height))
+    ]
+    header.append(' '.join((f'{i + 1:^3}' for i in range(num_stacks))))
+    moves = []
+    for _ in range(500 * scale):
+        # never empty a stack, the answer reads the top of every stack
+        from_idx = rng.choice([i for i, stack in enumerate(stacks) if len(stack) > 1])
+        to_idx = rng.choice([i for i in range(num_stacks) if i != from_idx])
+        amt = rng.randint(1, len(stacks[from_idx]) - 1)
+        stacks[to_idx].extend(stacks[from_idx][-amt:])
+        del stacks[from_idx][-amt:]
+        moves.append(f'move {amt} from {from_idx + 1} to {to_idx + 1}')
+    return '\n'.join(header) + '\n\n' + '\n'.join(moves) + '\n'
+
+
+def gen_day06(rng: random.Random, scale: int) -> str:
+    # three letters can never form a marker, so both markers only show up near the end
+    length = 4096 * scale
+    tail = ''.join(rng.sample(string.ascii_lowercase, 14)) + 'abc'
+    return ''.join((rng.choice('abc') for _ in range(length - len(tail)))) + tail + '\n'
+
+
+def random_name(rng: random.Random, taken: Collection[str]) -> str:
+    while True:
+        name = ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 8)))
+        if name not in taken:
+            return name
+
+
+def gen_day07(rng: random.Random, scale: int) -> str:
+    subdirs: List[Dict[str, int]] = [{}]
+    while len(subdirs) < 180 * scale:
+        parent = subdirs[rng.randrange(len(subdirs))]
+        parent[random_name(rng, parent)] = len(subdirs)
+        subdirs.append({})
+    lines = ['$ cd /']
+
+    def walk(idx: int):
+        lines.append('$ ls')
+        files = set()
+        for _ in range(rng.randint(0, 4)):
+            files.add(f'{random_name(rng, files)}.{"".join(rng.choices(string.ascii_lowercase, k=3))}')
+        entries = [f'{rng.randint(1000, 300000)} {name}' for name in files]
+        entries.extend((f'dir {name}' for name in subdirs[idx]))
+        rng.shuffle(entries)
+        lines.extend(entries)
+        for name, subdir_idx in subdirs[idx].items():
+            lines.append(f'$ cd {name}')
+            walk(subdir_idx)
+            lines.append('$ cd ..')
+
+    walk(0)
+    return '\n'.join(lines) + '\n'
+
+
+def gen_day08(rng: random.Random, scale: int) -> str:
+    side = scaled_side(99, scale)
+    return ''.join((
+        ''.join((str(rng.randint(0, 9)) for _ in range(side))) + '\n'
+        for _ in range(side)
+    ))
+
+
+def gen_day09(rng: random.Random, scale: int) -> str:
+    return ''.join((f'{rng.choice("LRUD")} {rng.randint(1, 20)}\n' for _ in range(2000 * scale)))
+
+
+def gen_day10(rng: random.Random, scale: int) -> str:
+    lines = []
+    x = 1
+    for _ in range(140 * scale):
+        if rng.random() < 0.3:
+            lines.append('noop')
+        else:
+            # keep X on the screen, so the sprite stays somewhere sensible
+            amt = rng.randint(-10, 10)
+            if not 0 <= x + amt < 40:
+                amt = -amt
+            x += amt
+            lines.append(f'addx {amt}')
+    return '\n'.join(lines) + '\n'
+
+
+PRIMES = [2, 3, 5, 7, 11, 13, 17, 19, 23]
+
+
+def gen_day11(rng: random.Random, scale: int) -> str:
+    num_monkeys = 8 * scale
+    blocks = []
+    for i in range(num_monkeys):
+        # cycling through a fixed set of primes keeps the part 2 modulus small. no 'old * old': an item
+        # that keeps coming back to a squaring monkey blows up part 1, where nothing bounds the worry level
+        op = rng.choice([f'old * {rng.randint(2, 19)}', f'old + {rng.randint(1, 8)}'])
+        targets = rng.sample([j for j in range(num_monkeys) if j != i], 2)
+        items = ', '.join((str(rng.randint(50, 99)) for _ in range(rng.randint(1, 8))))
+        blocks.append(f'''Monkey {i}:
+  Starting items: {items}
+  Operation: new = {op}
+  Test: divisible by {PRIMES[i % len(PRIMES)]}
+    If true: throw to monkey {targets[0]}
+    If false: throw to monkey {targets[1]}
+''')
+    return '\n'.join(blocks)
+
+
+def gen_day12(rng: random.Random, scale: int) -> str:
+    rows, cols = max(1, round(41 * scale ** 0.5)), max(26, round(80 * scale ** 0.5))
+    lines = []
+    for i in range(rows):
+        line = []
+        for j in range(cols):
+            height = j * 26 // cols  # the first row keeps these heights, so E is always reachable
+            if i:
+                height = max(0, height - rng.randint(0, 3))
+            line.append(chr(ord('a') + height))
+        lines.append(line)
+    lines[0][0] = 'S'
+    lines[0][cols - 1] = 'E'
+    return ''.join((''.join(line) + '\n' for line in lines))
+
+
+def gen_packet(rng: random.Random, depth: int):
+    if depth == 0 or rng.random() < 0.3:
+        return rng.randint(0, 10)
+    return [gen_packet(rng, depth - 1) for _ in range(rng.randint(0, 5))]
+
+
+def gen_day13(rng: random.Random, scale: int) -> str:
+    def gen_list():
+        return json.dumps([gen_packet(rng, 4) for _ in range(rng.randint(0, 5))], separators=(',', ':'))
+    return '\n'.join((f'{gen_list()}\n{gen_list()}\n' for _ in range(150 * scale)))
+
+
+def gen_day14(rng: random.Random, scale: int) -> str:
+    spread = scaled_side(50, scale)
+    depth = scaled_side(170, scale)
+    lines = []
+    for _ in range(150 * scale):
+        x, y = rng.randint(500 - spread, 500 + spread), rng.randint(10, depth)
+        path = [(x, y)]
+        for i in range(rng.randint(1, 6)):
+            if i % 2 == 0:
+                x += rng.randint(-8, 8)
+            else:
+                y = min(depth, max(10, y + rng.randint(-8, 8)))
+            path.append((x, y))
+        lines.append(' -> '.join((f'{x},{y}' for x, y in path)))
+    return '\n'.join(lines) + '\n'
+
+
+def gen_day15(rng: random.Random, scale: int) -> str:
+    # sensors hug the part 1 row, and their reach is small enough to leave gaps for part 2
+    lines = []
+    for _ in range(32 * scale):
+        sx, sy = rng.randint(0, 4000000), rng.randint(1000000, 3000000)
+        reach = rng.randint(10000, 1100000)
+        dx = rng.randint(-reach, reach)
+        dy = (reach - abs(dx)) * rng.choice((-1, 1))
+        lines.append(f'Sensor at x={sx}, y={sy}: closest beacon is at x={sx + dx}, y={sy + dy}')
+    return '\n'.join(lines) + '\n'
+
+
+def valve_name(idx: int) -> str:
+    return string.ascii_uppercase[idx // 26] + string.ascii_uppercase[idx % 26]
+
+
+def gen_day16(rng: random.Random, scale: int) -> str:
+    # only the tunnel network grows, the number of working valves stays put. two-letter names run out at
+    # 26 * 26 valves, past that the network grows denser instead: the tunnels the missing valves would have
+    # brought are added between the existing ones
+    num_valves = min(60 * scale, 26 * 26)
+    extra_tunnels = num_valves // 10 + (60 * scale - num_valves) * 11 // 10
+    names = [valve_name(i) for i in range(num_valves)]
+    rng.shuffle(names)
+    names.remove('AA')
+    names.insert(0, 'AA')
+    conns: Dict[str, List[str]] = {name: [] for name in names}
+    for i, name in enumerate(names[1:], 1):  # a random tree keeps everything reachable from AA
+        other = names[rng.randrange(i)]
+        conns[name].append(other)
+        conns[other].append(name)
+    for _ in range(extra_tunnels):
+        left, right = rng.sample(names, 2)
+        if right not in conns[left]:
+            conns[left].append(right)
+            conns[right].append(left)
+    flows = {name: 0 for name in names}
+    for name in rng.sample(names[1:], 15):
+        flows[name] = rng.randint(3, 25)
+    return ''.join((
+        f'Valve {name} has flow rate={flows[name]}; '
+        + (f'tunnels lead to valves {", ".join(conns[name])}' if len(conns[name]) > 1
+           else f'tunnel leads to valve {conns[name][0]}')
+        + '\n'
+        for name in names
+    ))
+
+
+def gen_day17(rng: random.Random, scale: int) -> str:
+    return ''.join((rng.choice('<>') for _ in range(10091 * scale))) + '\n'
+
+
+def gen_day18(rng: random.Random, scale: int) -> str:
+    side = scaled_side(20, scale, dims=3)
+    cubes = set()
+    while len(cubes) < min(2665 * scale, side ** 3 // 2):
+        cubes.add((rng.randrange(side), rng.randrange(side), rng.randrange(side)))
+    return ''.join((f'{x},{y},{z}\n' for x, y, z in cubes))
+
+
+def gen_day19(rng: random.Random, scale: int) -> str:
+    return ''.join((
+        f'Blueprint {i + 1}: Each ore robot costs {rng.randint(2, 4)} ore. '
+        f'Each clay robot costs {rng.randint(2, 4)} ore. '
+        f'Each obsidian robot costs {rng.randint(2, 4)} ore and {rng.randint(5, 20)} clay. '
+        f'Each geode robot costs {rng.randint(2, 4)} ore and {rng.randint(7, 20)} obsidian.\n'
+        for i in range(30 * scale)
+    ))
+
+
+def gen_day20(rng: random.Random, scale: int) -> str:
+    # exactly one zero, like the real input
+    numbers = [rng.choice((-1, 1)) * rng.randint(1, 10000) for _ in range(5000 * scale - 1)]
+    numbers.insert(rng.randrange(len(numbers) + 1), 0)
+    return ''.join((f'{num}\n' for num in numbers))
+
+
+def gen_day21(rng: random.Random, scale: int) -> str:
+    names = set()
+
+    def new_name() -> str:
+        while True:
+            name = ''.join(rng.choices(string.ascii_lowercase, k=4))
+            if name not in names and name not in ('root', 'humn'):
+                names.add(name)
+                return name
+
+    lines = []
+
+    def add_number(name: str) -> Tuple[str, int]:
+        value = rng.randint(1, 20)
+        lines.append(f'{name}: {value}')
+        return name, value
+
+    def gen_tree(size: int, with_human: bool) -> Tuple[str, int]:
+        # '*' and '/' always get a plain number on the right, so part 2 never divides by something unknown.
+        # on the human's path every operation is exact, so there is an integer solution to invert towards
+        if size < 3:  # an operation needs itself and two operands
+            return add_number('humn' if with_human else new_name())
+        name = new_name()
+        op = rng.choice('+-*/')
+        if op in '*/':
+            left, left_value = gen_tree(size - 2, with_human)
+            right, right_value = add_number(new_name())
+            if op == '/' and with_human and left_value % right_value:
+                op = '*'
+        else:
+            left_size = rng.randint(1, size - 2)
+            human_left = with_human and rng.random() < 0.5
+            left, left_value = gen_tree(left_size, human_left)
+            right, right_value = gen_tree(size - 1 - left_size, with_human and not human_left)
+        lines.append(f'{name}: {left} {op} {right}')
+        return name, {
+            '+': lambda: left_value + right_value,
+            '-': lambda: left_value - right_value,
+            '*': lambda: left_value * right_value,
+            '/': lambda: left_value // right_value
+        }[op]()
+
+    size = 2000 * scale
+    human_side, human_value = gen_tree(size // 2, True)
+    other_side, other_value = gen_tree(size - 3 - size // 2, False)
+    # balance the other side, so the human's number is a solution for part 2
+    balanced, diff = new_name(), new_name()
+    lines.append(f'{diff}: {abs(human_value - other_value)}')
+    lines.append(f'{balanced}: {other_side} {"+" if human_value >= other_value else "-"} {diff}')
+    lines.append(f'root: {human_side} + {balanced}')
+    rng.shuffle(lines)
+    return '\n'.join(lines) + '\n'
+
+
+def gen_day22(rng: random.Random, scale: int) -> str:
+    side = scaled_side(50, scale)
+    # same net as the real input:  .12 / .3. / 45. / 6..
+    net = [(0, 1), (0, 2), (1, 1), (2, 0), (2, 1), (3, 0)]
+    rows = []
+    for i in range(4 * side):
+        row = []
+        for j in range(3 * side):
+            if (i // side, j // side) in net:
+                row.append('#' if rng.random() < 0.05 and (i, j) != (0, side) else '.')
+            else:
+                row.append(' ')
+        rows.append(''.join(row).rstrip())
+    route = str(rng.randint(1, side))
+    for _ in range(2000 * scale):
+        route += rng.choice('LR') + str(rng.randint(1, side))
+    return '\n'.join(rows) + '\n\n' + route + '\n'
+
+
+def gen_day23(rng: random.Random, scale: int) -> str:
+    side = scaled_side(71, scale)
+    return ''.join((
+        ''.join(('#' if rng.random() < 0.5 else '.' for _ in range(side))) + '\n'
+        for _ in range(side)
+    ))
+
+
+def gen_day24(rng: random.Random, scale: int) -> str:
+    # only the width grows: blizzard states repeat every lcm(width, height) minutes, and the
+    # search graph holds all of them
+    height, width = 25, 120 * scale
+    lines = ['#.' + '#' * width]
+    for i in range(height):
+        row = []
+        for j in range(width):
+            # like the real input, no vertical blizzards in the entrance and exit columns
+            choices = '<>.' if j in (0, width - 1) else '<>^v.'
+            row.append(rng.choice(choices) if rng.random() < 0.9 else '.')
+        lines.append('#' + ''.join(row) + '#')
+    lines.append('#' * width + '.#')
+    return '\n'.join(lines) + '\n'
+
+
+GENERATORS: Dict[int, Callable[[random.Random, int], str]] = {
+    1: gen_day01,
+    2: gen_day02,
+    3: gen_day03,
+    4: gen_day04,
+    5: gen_day05,
+    6: gen_day06,
+    7: gen_day07,
+    8: gen_day08,
+    9: gen_day09,
+    10: gen_day10,
+    11: gen_day11,
+    12: gen_day12,
+    13: gen_day13,
+    14: gen_day14,
+    15: gen_day15,
+    16: gen_day16,
+    17: gen_day17,
+    18: gen_day18,
+    19: gen_day19,
+    20: gen_day20,
+    21: gen_day21,
+    22: gen_day22,
+    23: gen_day23,
+    24: gen_day24,
+}
+
+
+def generate(day: int, scale: int = 1, seed: int = 0) -> str:
+    rng = random.Random(f'{seed}:{day}:{scale}')
+    return GENERATORS[day](rng, scale)
@@ -0,0 +1,117 @@
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from contextlib import redirect_stdout
+from math import log
+import os
+import statistics
+import time
+import tracemalloc
+
+from attrs import define
+
+from aoc.runner import load_day, format_duration, format_bytes
+from bench.generators import generate
+
+
+STAGES = ('parse', 'part1', 'part2')
+
+
+@define
+class Measurement:
+    day: int
+    stage: str
+    scale: int
+    input_size: int  # in bytes
+    times: List[float]
+    peak_memory: Optional[int] = None  # allocated on top of what was there before the stage, in bytes
+
+    def median_time(self) -> float:
+        return statistics.median(self.times)
+
+
+def parse_stages(stage_spec: str) -> List[str]:
+    # accepts 'parse,1,2' as well as 'parse,part1,part2'
+    stages = [stage if stage in STAGES else f'part{stage}' for stage in stage_spec.split(',') if stage]
+    for stage in stages:
+        if stage not in STAGES:
+            raise ValueError(f'no such stage: {stage}')
+    return stages
+
+
+def stage_callable(module: Any, stage: str, the_input: str) -> Callable[[], Any]:
+    if stage == 'parse':
+        return lambda: module.parse(the_input)
+    parsed = module.parse(the_input)  # parts are timed on their own, parsing happens up front
+    part_fn = getattr(module, stage)
+    return lambda: part_fn(parsed)
+
+
+def measure_peak_memory(fn: Callable[[], Any]) -> int:
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        fn()
+        return tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+
+
+def measure_stage(day: int, stage: str, scale: int, the_input: str, repeats: int, measure_memory=True) \
+        -> Measurement:
+    module = load_day(day)
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        fn = stage_callable(module, stage, the_input)
+        times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+        # tracemalloc slows everything down, so memory gets its own run instead of skewing the timings
+        peak_memory = measure_peak_memory(fn) if measure_memory else None
+    return Measurement(day, stage, scale, len(the_input.encode()), times, peak_memory)
+
+
+def run_benchmark(day: int, scales: Sequence[int], stages: Sequence[str] = STAGES, repeats=3, seed=0,
+                  measure_memory=True) -> List[Measurement]:
+    measurements = []
+    for scale in scales:
+        the_input = generate(day, scale, seed)
+        for stage in stages:
+            measurements.append(measure_stage(day, stage, scale, the_input, repeats, measure_memory))
+    return measurements
+
+
+def fit_exponent(points: Sequence[Tuple[float, float]]) -> Optional[float]:
+    # least squares slope on a log-log scale: value ~ size ** exponent
+    points = [(log(size), log(value)) for size, value in points if size > 0 and value > 0]
+    if len({x for x, _ in points}) < 2:
+        return None
+    mean_x = statistics.fmean((x for x, _ in points))
+    mean_y = statistics.fmean((y for _, y in points))
+    return sum(((x - mean_x) * (y - mean_y) for x, y in points)) / sum(((x - mean_x) ** 2 for x, _ in points))
+
+
+def group_measurements(measurements: List[Measurement]) -> Dict[Tuple[int, str], List[Measurement]]:
+    groups: Dict[Tuple[int, str], List[Measurement]] = {}
+    for measurement in measurements:
+        groups.setdefault((measurement.day, measurement.stage), []).append(measurement)
+    return groups
+
+
+def format_exponent(exponent: Optional[float]) -> str:
+    return '-' if exponent is None else f'n^{exponent:.2f}'
+
+
+def format_benchmark(measurements: List[Measurement]) -> str:
+    lines = []
+    for (day, stage), group in group_measurements(measurements).items():
+        lines.append(f'day {day} {stage}')
+        lines.append(f'  {"scale":>6}  {"bytes":>11}  {"median":>9}  {"min":>9}  {"peak mem":>10}')
+        for measurement in group:
+            lines.append(f'  {measurement.scale:>6}  {measurement.input_size:>11}  '
+                         f'{format_duration(measurement.median_time()):>9}  '
+                         f'{format_duration(min(measurement.times)):>9}  {format_bytes(measurement.peak_memory):>10}')
+        time_exponent = fit_exponent([(m.input_size, m.median_time()) for m in group])
+        memory_exponent = fit_exponent([(m.input_size, m.peak_memory) for m in group if m.peak_memory is not None])
+        lines.append(f'  time ~ {format_exponent(time_exponent)}, memory ~ {format_exponent(memory_exponent)}')
+        lines.append('')
+    return '\n'.join(lines).rstrip()
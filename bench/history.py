@@ -0,0 +1,143 @@
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timezone
+import json
+import platform
+import statistics
+import subprocess
+
+from attrs import asdict
+
+from aoc.paths import ROOT, STATE_DIR
+from aoc.runner import format_duration, format_bytes
+from bench.harness import Measurement
+
+
+HISTORY_PATH = STATE_DIR / 'bench_history.json'
+
+# run key to the runs recorded under it, oldest first
+History = Dict[str, List[dict]]
+MeasurementKey = Tuple[int, str, int, int]  # day, stage, scale, seed
+
+
+def git_commit() -> str:
+    # uncommitted changes to tracked files get their own key, they are not what the commit measures
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True, text=True,
+                                check=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return f'{commit}+dirty' if status else commit
+
+
+def machine_id() -> str:
+    return f'{platform.node()}/{platform.machine()}/{platform.python_implementation()}-{platform.python_version()}'
+
+
+def run_key(commit: str, machine: str) -> str:
+    return f'{commit} {machine}'
+
+
+def load_history() -> History:
+    if not HISTORY_PATH.exists():
+        return {}
+    with open(HISTORY_PATH) as f:
+        return json.load(f)
+
+
+def save_history(history: History):
+    STATE_DIR.mkdir(exist_ok=True)
+    tmp_path = HISTORY_PATH.with_suffix('.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(history, f, indent=1)
+    tmp_path.replace(HISTORY_PATH)
+
+
+def record_run(measurements: List[Measurement], seed: int, commit: Optional[str] = None,
+               machine: Optional[str] = None) -> str:
+    commit = git_commit() if commit is None else commit
+    machine = machine_id() if machine is None else machine
+    key = run_key(commit, machine)
+    history = load_history()
+    history.setdefault(key, []).append({
+        'commit': commit,
+        'machine': machine,
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'seed': seed,
+        'measurements': [asdict(measurement) for measurement in measurements],
+    })
+    save_history(history)
+    return key
+
+
+def find_key(history: History, machine: str, commit_prefix: Optional[str] = None,
+             exclude: Optional[str] = None) -> Optional[str]:
+    # the most recently recorded key on machine, optionally only those whose commit starts with the prefix.
+    # dicts keep insertion order, and a key is inserted when first recorded
+    candidates = [
+        key for key, runs in history.items()
+        if runs[0]['machine'] == machine and key != exclude
+        and (commit_prefix is None or runs[0]['commit'].startswith(commit_prefix))
+    ]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda key: history[key][-1]['timestamp'])
+
+
+def pooled_measurements(runs: List[dict]) -> Dict[MeasurementKey, Measurement]:
+    # every recorded run of a key counts, the timings of repeated benchmark runs are pooled. different
+    # seeds mean different inputs, so those are kept apart
+    pooled: Dict[MeasurementKey, Measurement] = {}
+    peaks: Dict[MeasurementKey, List[int]] = {}
+    for run in runs:
+        for entry in run['measurements']:
+            measurement = Measurement(**entry)
+            key = (measurement.day, measurement.stage, measurement.scale, run['seed'])
+            if key not in pooled:
+                pooled[key] = Measurement(measurement.day, measurement.stage, measurement.scale,
+                                          measurement.input_size, [])
+            pooled[key].times.extend(measurement.times)
+            if measurement.peak_memory is not None:
+                peaks.setdefault(key, []).append(measurement.peak_memory)
+    for key, key_peaks in peaks.items():
+        pooled[key].peak_memory = int(statistics.median(key_peaks))
+    return pooled
+
+
+def relative_change(old: float, new: float) -> Optional[float]:
+    return None if old <= 0 else (new - old) / old
+
+
+def format_change(change: Optional[float]) -> str:
+    return '-' if change is None else f'{change * 100:+.1f}%'
+
+
+def compare_runs(baseline: Dict[MeasurementKey, Measurement], candidate: Dict[MeasurementKey, Measurement],
+                 time_threshold: float, memory_threshold: float) -> Tuple[List[str], int]:
+    # thresholds are relative, 0.1 flags anything over 10% slower or larger. returns the report lines
+    # and the number of regressions
+    lines = [f'{"day":>3}  {"stage":<6}  {"scale":>6}  {"baseline":>9}  {"now":>9}  {"change":>8}  '
+             f'{"base mem":>10}  {"mem now":>10}  {"change":>8}']
+    regressions = 0
+    for key in sorted(baseline.keys() & candidate.keys()):
+        old, new = baseline[key], candidate[key]
+        time_change = relative_change(old.median_time(), new.median_time())
+        memory_change = None
+        if old.peak_memory is not None and new.peak_memory is not None:
+            memory_change = relative_change(old.peak_memory, new.peak_memory)
+        flags = []
+        if time_change is not None and time_change > time_threshold:
+            flags.append('SLOWER')
+        if memory_change is not None and memory_change > memory_threshold:
+            flags.append('MORE MEMORY')
+        regressions += bool(flags)
+        day, stage, scale, _ = key
+        lines.append(f'{day:>3}  {stage:<6}  {scale:>6}  {format_duration(old.median_time()):>9}  '
+                     f'{format_duration(new.median_time()):>9}  {format_change(time_change):>8}  '
+                     f'{format_bytes(old.peak_memory):>10}  {format_bytes(new.peak_memory):>10}  '
+                     f'{format_change(memory_change):>8}  {" ".join(flags)}'.rstrip())
+    only_one = len(baseline.keys() ^ candidate.keys())
+    if only_one:
+        lines.append(f'{only_one} measurements were only recorded in one of the two runs and are left out')
+    return lines, regressions
@@ -0,0 +1,67 @@
+from typing import Callable, Dict, List, Sequence, Tuple
+import statistics
+import time
+
+from attrs import define
+
+from aoc.runner import load_day, format_duration
+from bench.generators import generate
+
+
+# day to how the parsed part is cut out of a whole input, and the names of the fast and the parsy parser
+PARSERS: Dict[int, Tuple[Callable[[str], str], str, str]] = {
+    5: (lambda the_input: the_input.split('\n\n', 1)[1], 'parse_instructions', 'parse_instructions_parsy'),
+    15: (lambda the_input: the_input, 'parse_sensors', 'parse_sensors_parsy'),
+    16: (lambda the_input: the_input, 'parse_valves', 'parse_valves_parsy'),
+    22: (lambda the_input: the_input.split('\n\n')[1], 'parse_route', 'parse_route_parsy'),
+}
+
+
+@define
+class ParserMeasurement:
+    day: int
+    scale: int
+    input_size: int  # in bytes, of the parsed part only
+    fast_time: float  # median
+    parsy_time: float
+
+    def speedup(self) -> float:
+        return self.parsy_time / self.fast_time if self.fast_time > 0 else float('inf')
+
+
+def median_time(fn: Callable[[str], object], text: str, repeats: int) -> float:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(text)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def compare_parsers(day: int, scales: Sequence[int], repeats=3, seed=0) -> List[ParserMeasurement]:
+    if day not in PARSERS:
+        raise ValueError(f'day {day} has no parsy parser, only days {", ".join(map(str, PARSERS))} do')
+    select, fast_name, parsy_name = PARSERS[day]
+    module = load_day(day)
+    fast, parsy = getattr(module, fast_name), getattr(module, parsy_name)
+    measurements = []
+    for scale in scales:
+        text = select(generate(day, scale, seed))
+        if fast(text) != parsy(text):  # a faster parser is no use if it parses something else
+            raise AssertionError(f'day {day}: {fast_name} and {parsy_name} disagree at scale {scale}')
+        measurements.append(ParserMeasurement(day, scale, len(text.encode()),
+                                              median_time(fast, text, repeats), median_time(parsy, text, repeats)))
+    return measurements
+
+
+def format_throughput(size: int, seconds: float) -> str:
+    return '-' if seconds <= 0 else f'{size / seconds / 2 ** 20:.1f} MiB/s'
+
+
+def format_parser_comparison(measurements: List[ParserMeasurement]) -> str:
+    lines = [f'{"day":>3}  {"scale":>6}  {"bytes":>11}  {"fast":>9}  {"parsy":>9}  {"fast":>12}  {"parsy":>12}  speedup']
+    for m in measurements:
+        lines.append(f'{m.day:>3}  {m.scale:>6}  {m.input_size:>11}  {format_duration(m.fast_time):>9}  '
+                     f'{format_duration(m.parsy_time):>9}  {format_throughput(m.input_size, m.fast_time):>12}  '
+                     f'{format_throughput(m.input_size, m.parsy_time):>12}  {m.speedup():.1f}x')
+    return '\n'.join(lines)
@@ -0,0 +1,58 @@
+from typing import List, Optional, Sequence, Tuple
+
+
+Coord = Tuple[int, int]
+Cube = Tuple[int, int, int]
+
+ORTHOGONAL_STEPS_2D: List[Coord] = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+ALL_STEPS_2D: List[Coord] = [(i, j) for i in (-1, 0, 1) for j in (-1, 0, 1) if i or j]
+ORTHOGONAL_STEPS_3D: List[Cube] = [
+    (1, 0, 0), (-1, 0, 0), (0, 1, 0), (0, -1, 0), (0, 0, 1), (0, 0, -1),
+]
+
+
+class Packing:
+    # points as single ints, so hot loops can step with int additions and keep int-keyed sets instead of
+    # allocating a tuple per point. the last coordinate varies fastest: (a, b) packs to
+    # (a + bias[0]) * sizes[1] + (b + bias[1]). every coordinate but the first must stay within
+    # [-bias, size - bias). the first may be unbounded (size None) and even negative, divmod floors
+    __slots__ = ('sizes', 'bias', 'strides')
+
+    def __init__(self, sizes: Sequence[Optional[int]], bias: Optional[Sequence[int]] = None):
+        self.sizes = tuple(sizes)
+        self.bias = tuple(bias) if bias is not None else (0,) * len(self.sizes)
+        strides = []
+        stride = 1
+        for size in reversed(self.sizes):
+            strides.append(stride)
+            stride *= size or 1
+        self.strides = tuple(reversed(strides))
+
+    def pack(self, point: Sequence[int]) -> int:
+        return sum(((c + b) * s for c, b, s in zip(point, self.bias, self.strides)))
+
+    def unpack(self, packed: int) -> Tuple[int, ...]:
+        result = []
+        for stride, bias in zip(self.strides, self.bias):
+            c, packed = divmod(packed, stride)
+            result.append(c - bias)
+        return tuple(result)
+
+    def offset(self, step: Sequence[int]) -> int:
+        # only meaningful while the step stays within the bounds
+        return sum((d * s for d, s in zip(step, self.strides)))
+
+    def offsets(self, steps: Sequence[Sequence[int]]) -> List[int]:
+        return [self.offset(step) for step in steps]
+
+    def volume(self) -> int:
+        if self.sizes[0] is None:
+            raise ValueError('an unbounded packing has no volume')
+        return self.sizes[0] * self.strides[0]
+
+
+def bounding_packing(points: Sequence[Sequence[int]], margin=0) -> Packing:
+    # the smallest packing holding all points, with margin free positions on every side
+    mins = [min(coords) - margin for coords in zip(*points)]
+    maxs = [max(coords) + margin for coords in zip(*points)]
+    return Packing([hi - lo + 1 for lo, hi in zip(mins, maxs)], [-lo for lo in mins])
@@ -1,9 +1,110 @@
+from itertools import chain, repeat
+import heapq
+import os
+import re
+import sys
+
+from loader import extract_ints, input_source, is_stream, map_input, open_input
+
+
+BLANK_LINE = rb'\r?\n\r?\n'
+
+
+def parse(the_input):
+    return [extract_ints(group) for group in the_input.split('\n\n')]
+
+
+def top_k(totals, k):
+    # the k largest totals, largest first, from a min-heap that never holds more than k of them:
+    # O(n log k) time and O(k) memory however many totals there are
+    heap = []
+    for total in totals:
+        if len(heap) < k:
+            heapq.heappush(heap, total)
+        elif total > heap[0]:
+            heapq.heapreplace(heap, total)
+    return sorted(heap, reverse=True)
+
+
+def part1(elves):
+    return max(map(sum, elves))
+
+
+def part2(elves):
+    return sum(top_k(map(sum, elves), 3))
+
+
+def elf_totals(lines):
+    total = None
+    for line in lines:
+        line = line.strip()
+        if line:
+            total = (total or 0) + int(line)
+        elif total is not None:
+            yield total
+            total = None
+    if total is not None:
+        yield total
+
+
+def solve_stream(stream, k=3):
+    # both parts in one pass over the lines, keeping only the running total and the k largest so far
+    top = top_k(elf_totals(stream), k)
+    return top[0] if top else 0, sum(top)
+
+
+def chunk_bounds(data, chunks):
+    # about equally large chunks of data that start right after a blank line, so no elf is cut in two
+    bounds = [0]
+    for i in range(1, chunks):
+        match = re.compile(BLANK_LINE).search(data, max(len(data) * i // chunks, bounds[-1]))
+        if match is None:
+            break
+        bounds.append(match.end())
+    if bounds[-1] < len(data):
+        bounds.append(len(data))
+    return bounds
+
+
+def chunk_totals(data, start, end):
+    # only the slice of the current elf gets copied out of data
+    for match in re.compile(BLANK_LINE).finditer(data, start, end):
+        yield sum(map(int, data[start:match.start()].split()))
+        start = match.end()
+    if data[start:end].strip():
+        yield sum(map(int, data[start:end].split()))
+
+
+def chunk_top_k(path, start, end, k):
+    with map_input(path) as data:
+        return top_k(chunk_totals(data, start, end), k)
+
+
+def solve_parallel(path, k=3, jobs=0):
+    # both parts with a process per chunk of the file. every worker maps the file itself and only sends
+    # back its k largest totals, the k largest of those are the k largest overall
+    from concurrent.futures import ProcessPoolExecutor  # slow to import, and only needed here
+    jobs = jobs or os.cpu_count()
+    with map_input(path) as data:
+        bounds = chunk_bounds(data, jobs)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        tops = executor.map(chunk_top_k, repeat(path), bounds[:-1], bounds[1:], repeat(k))
+        top = top_k(chain.from_iterable(tops), k)
+    return top[0] if top else 0, sum(top)
+
+
 def main():
-    with open('input/day01_input.txt') as f:
-        lines = ''.join(f.readlines())
-        elves = [[int(el.strip()) for el in group.split('\n') if el.strip()] for group in lines.split('\n\n')]
-        print(max(map(sum, elves)))
-        print(sum(sorted(map(sum, elves))[-3:]))
+    # python day01.py [input] [jobs]: with jobs other than 1 a file gets split over that many processes, 0 for
+    # one per cpu. stdin can only be streamed
+    source = input_source(1)
+    jobs = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    if jobs != 1 and not is_stream(source):
+        answers = solve_parallel(source, jobs=jobs)
+    else:
+        with open_input(source) as stream:
+            answers = solve_stream(stream)
+    for answer in answers:
+        print(answer)
 
 
 if __name__ == '__main__':
@@ -1,3 +1,6 @@
+from loader import as_view, input_source, open_input
+
+
 def match_result(player1, player2):  # 0 if player2 loses, 1 for a draw, 2 for a win
     index_diff = ((player2 - 1) - (player1 - 1)) % 3  # 1 for a win, 0 for a draw, 2 for a loss
     return (index_diff + 1) % 3
@@ -12,12 +15,64 @@ def choose_hand(player1, desired_result):
     return (player1 - 1 + offset) % 3 + 1
 
 
+# there are only nine possible lines. line 3 * (player1 - 1) + (player2 - 1) scores SCORES1 when the second
+# column is the hand to play and SCORES2 when it is the desired result
+LINES = [f'{player1} {player2}' for player1 in 'ABC' for player2 in 'XYZ']
+LINES_BYTES = [line.encode() for line in LINES]
+SCORES1 = [get_score(player1, player2) for player1 in (1, 2, 3) for player2 in (1, 2, 3)]
+SCORES2 = [get_score(player1, choose_hand(player1, result)) for player1 in (1, 2, 3) for result in (1, 2, 3)]
+
+
+def count_lines(data):
+    # how often each of the nine lines occurs. a column letter never follows a space or another letter
+    # except within a line, so counting substrings counts lines, each count one pass in c over the text
+    lines = LINES if isinstance(data, str) else LINES_BYTES
+    data = data if isinstance(data, (str, bytes, bytearray)) else bytes(data)  # mmaps and views can not count
+    return [data.count(line) for line in lines]
+
+
+def count_lines_numpy(data):
+    # the same histogram in a single vectorized pass: each space sits between the two letters of a line
+    import numpy as np  # optional, and slow to import
+    codes = np.frombuffer(as_view(data), dtype=np.uint8)
+    spaces = np.flatnonzero(codes == ord(' '))
+    line_index = (codes[spaces - 1].astype(np.intp) - ord('A')) * 3 + (codes[spaces + 1] - ord('X'))
+    return np.bincount(line_index, minlength=9).tolist()
+
+
+def score(counts, scores):
+    return sum((count * line_score for count, line_score in zip(counts, scores)))
+
+
+def parse(the_input):
+    return count_lines(the_input)
+
+
+def part1(counts):
+    return score(counts, SCORES1)
+
+
+def part2(counts):
+    return score(counts, SCORES2)
+
+
+def solve_stream(stream, chunk_size=1 << 16):
+    # both parts a chunk at a time. a line cut off at the end of a chunk is carried over to the next one
+    counts = [0] * 9
+    rest = ''
+    for chunk in iter(lambda: stream.read(chunk_size), ''):
+        chunk = rest + chunk
+        cut = chunk.rfind('\n') + 1
+        counts = [total + count for total, count in zip(counts, count_lines(chunk[:cut]))]
+        rest = chunk[cut:]
+    counts = [total + count for total, count in zip(counts, count_lines(rest))]
+    return part1(counts), part2(counts)
+
+
 def main():
-    with open('input/day02_input.txt') as f:
-        lines = f.readlines()
-        matches = [(ord(line.strip()[0]) - ord('A') + 1, ord(line.strip()[2]) - ord('X') + 1) for line in lines]
-        print(sum([get_score(*match) for match in matches]))
-        print(sum([get_score(match[0], choose_hand(match[0], match[1])) for match in matches]))
+    with open_input(input_source(2)) as stream:
+        for answer in solve_stream(stream):
+            print(answer)
 
 
 if __name__ == '__main__':
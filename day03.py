@@ -1,14 +1,76 @@
-def sum_priorities(char_list):
-    return sum([ord(c) - (ord('a') - 1 if c.islower() else ord('A') - 27) for c in char_list])
+from functools import reduce
+from operator import and_
+import string
+
+from loader import input_source, open_input
+
+
+# byte value to the bit of its item, bit priority - 1, so a single item mask has its priority as bit_length
+ITEM_BITS = [0] * 256
+for bit, letter in enumerate(string.ascii_lowercase + string.ascii_uppercase):
+    ITEM_BITS[ord(letter)] = 1 << bit
+
+
+def item_mask(items: bytes) -> int:
+    mask = 0
+    for byte in items:
+        mask |= ITEM_BITS[byte]
+    return mask
+
+
+def sum_priorities(mask: int) -> int:
+    # of every item in the mask, not just the first
+    total = 0
+    while mask:
+        lowest = mask & -mask
+        total += lowest.bit_length()
+        mask ^= lowest
+    return total
+
+
+def rucksack_masks(line: bytes):
+    return item_mask(line[:len(line) // 2]), item_mask(line[len(line) // 2:])
+
+
+def parse(the_input):
+    # every rucksack as the masks of its two compartments
+    return [rucksack_masks(line) for line in the_input.encode().split()]
+
+
+def part1(rucksacks):
+    return sum((sum_priorities(left & right) for left, right in rucksacks))
+
+
+def part2(rucksacks, group_size=3):
+    masks = [left | right for left, right in rucksacks]
+    return sum((sum_priorities(reduce(and_, masks[i:i + group_size]))
+                for i in range(0, len(masks), group_size)))
+
+
+def solve_stream(stream, group_size=3):
+    # both parts line by line. a group of any size is only its running intersection and how many joined it
+    total1 = total2 = 0
+    group, group_len = -1, 0
+    for line in stream:
+        line = line.strip().encode()
+        if not line:
+            continue
+        left, right = rucksack_masks(line)
+        total1 += sum_priorities(left & right)
+        group &= left | right
+        group_len += 1
+        if group_len == group_size:
+            total2 += sum_priorities(group)
+            group, group_len = -1, 0
+    if group_len:
+        total2 += sum_priorities(group)
+    return total1, total2
 
 
 def main():
-    with open('input/day03_input.txt') as f:
-        lines = [line.strip() for line in f.readlines()]
-    duplicates = [list(set(line[:len(line) // 2]).intersection(set(line[len(line) // 2:])))[0] for line in lines]
-    print(sum_priorities(duplicates))
-    elf_groups = [list(set(lines[i * 3]).intersection(*map(set, lines[i * 3 + 1:i * 3 + 3])))[0] for i in range(len(lines) // 3)]
-    print(sum_priorities(elf_groups))
+    with open_input(input_source(3)) as stream:
+        for answer in solve_stream(stream):
+            print(answer)
 
 
 if __name__ == '__main__':
@@ -1,4 +1,12 @@
+from array import array
+from bisect import bisect_left, bisect_right
+
+from loader import extract_ints, input_source, open_input
+
+
 class Range:
+    __slots__ = ('lb', 'ub')
+
     def __init__(self, lb, ub):
         self.lb = lb
         self.ub = ub
@@ -20,15 +28,113 @@ def range_from_str(rangestr):
     return Range(*map(int,rangestr.split('-')))
 
 
+class RangeArray:
+    # ranges as consecutive lb, ub in one flat array of machine ints rather than an object each.
+    # indexing creates the Range
+    __slots__ = ('bounds',)
+
+    def __init__(self, bounds=()):
+        self.bounds = array('q', bounds)
+
+    def __len__(self):
+        return len(self.bounds) // 2
+
+    def __getitem__(self, i) -> Range:
+        return Range(self.bounds[2 * i], self.bounds[2 * i + 1])
+
+    def __iter__(self):
+        bounds = iter(self.bounds)
+        return (Range(lb, ub) for lb, ub in zip(bounds, bounds))
+
+    def lbs(self) -> array:
+        return self.bounds[0::2]
+
+    def ubs(self) -> array:
+        return self.bounds[1::2]
+
+    def pairs(self):
+        # ranges 2i and 2i + 1, the two ranges of a line
+        ranges = iter(self)
+        return zip(ranges, ranges)
+
+
+class RangeIndex:
+    # the lower and upper bounds of many ranges, each sorted on its own, answer point and overlap counts with
+    # two bisections. containing [a, b] needs both bounds of a range at once: the upper bounds go in a
+    # fenwick tree over the ranges ordered by lower bound, every node keeping its block sorted, so a count
+    # bisects O(log n) nodes
+    __slots__ = ('lbs', 'ubs', 'tree')
+
+    def __init__(self, ranges: RangeArray):
+        lbs, ubs = ranges.lbs(), ranges.ubs()
+        self.lbs = array('q', sorted(lbs))
+        self.ubs = array('q', sorted(ubs))
+        ubs_by_lb = [ub for _, ub in sorted(zip(lbs, ubs))]
+        self.tree = [array('q')] + [
+            array('q', sorted(ubs_by_lb[i - (i & -i):i]))
+            for i in range(1, len(ubs_by_lb) + 1)
+        ]
+
+    def __len__(self):
+        return len(self.lbs)
+
+    def count_overlapping(self, a, b=None) -> int:
+        # ranges sharing a number with [a, b], or containing a. a range misses [a, b] when it ends before a
+        # or starts after b, never both
+        b = a if b is None else b
+        return bisect_right(self.lbs, b) - bisect_left(self.ubs, a)
+
+    def count_containing(self, a, b=None) -> int:
+        # ranges that are a superset of [a, b]: starting at or before a and ending at or after b
+        if b is None or a == b:
+            return self.count_overlapping(a)
+        count = 0
+        i = bisect_right(self.lbs, a)
+        while i:
+            node = self.tree[i]
+            count += len(node) - bisect_left(node, b)
+            i -= i & -i
+        return count
+
+    def count_overlapping_pairs(self) -> int:
+        # all pairs minus the disjoint ones. a disjoint pair is counted once, at the range that ends
+        # before the other one starts. O(n log n) instead of comparing all pairs
+        n = len(self)
+        disjoint = sum((n - bisect_right(self.lbs, ub) for ub in self.ubs))
+        return n * (n - 1) // 2 - disjoint
+
+
+def parse(the_input):
+    # four bounds per line, '2-4,6-8'. unsigned, the dashes are separators
+    return RangeArray(extract_ints(the_input, signed=False))
+
+
+def part1(ranges):
+    return sum((1 for left, right in ranges.pairs()
+                if left.is_superset(right) or right.is_superset(left)))
+
+
+def part2(ranges):
+    return sum((1 for left, right in ranges.pairs()
+                if left.overlap(right)))
+
+
+def solve_stream(stream):
+    # both parts line by line, without keeping the pairs
+    contained = overlapping = 0
+    for line in stream:
+        bounds = extract_ints(line, signed=False)
+        if bounds:
+            left, right = Range(*bounds[:2]), Range(*bounds[2:])
+            contained += left.is_superset(right) or right.is_superset(left)
+            overlapping += left.overlap(right)
+    return contained, overlapping
+
+
 def main():
-    with open('input/day04_input.txt') as f:
-        rangepairs = [tuple(map(range_from_str, line.strip().split(','))) for line in f.readlines()]
-    full_contains_count = sum((1 for left, right in rangepairs
-                               if left.is_superset(right) or right.is_superset(left)))
-    print(full_contains_count)
-    overlap_count = sum((1 for left, right in rangepairs
-                         if left.overlap(right)))
-    print(overlap_count)
+    with open_input(input_source(4)) as stream:
+        for answer in solve_stream(stream):
+            print(answer)
 
 
 if __name__ == '__main__':
@@ -1,45 +1,124 @@
-from parsy import string, decimal_digit, seq
+from functools import cache
+
+from loader import extract_ints, input_source, open_input
 
 
 def to_instr_tuple(*, amt, from_idx, to_idx):
     return amt, from_idx, to_idx
 
 
-instruction = seq(
-    __tag1=string('move '),
-    amt=decimal_digit.at_least(1).concat().map(int),
-    __tag2=string(' from '),
-    from_idx=decimal_digit.map(int),
-    __tag3=string(' to '),
-    to_idx=decimal_digit.map(int)
-).combine_dict(to_instr_tuple) << string('\n')
+@cache
+def instruction():
+    # the original parsy grammar, kept as the reference for the parse benchmark
+    from parsy import string, decimal_digit, seq
+    return seq(
+        __tag1=string('move '),
+        amt=decimal_digit.at_least(1).concat().map(int),
+        __tag2=string(' from '),
+        from_idx=decimal_digit.at_least(1).concat().map(int),
+        __tag3=string(' to '),
+        to_idx=decimal_digit.at_least(1).concat().map(int)
+    ).combine_dict(to_instr_tuple) << string('\n')
 
 
 def apply_instruction(cargo, instr, reverse=True):
+    # stacks are lists with their top at the end, so a move only touches the amt moved crates: O(amt)
     amt, from_idx, to_idx = instr
-    to_take, new_from = cargo[from_idx][:amt], cargo[from_idx][amt:]
-    new_to = (list(reversed(to_take)) if reverse else to_take) + cargo[to_idx]
-    cargo[from_idx] = new_from
-    cargo[to_idx] = new_to
+    from_stack = cargo[from_idx]
+    split = max(len(from_stack) - amt, 0)
+    to_take = from_stack[split:]
+    del from_stack[split:]
+    if reverse:  # the 9000 moves one crate at a time, the 9001 all at once
+        to_take.reverse()
+    cargo[to_idx].extend(to_take)
 
 
-def main():
-    with open('input/day05_input.txt') as f:
-        lines = f.readlines()
-    cargo_lines = lines[:9]
-    instruction_lines = lines[10:]
-    cargo = {
-        i: list(''.join([cargo_lines[j][4 * (i - 1) + 1] for j in range(8)]).strip())
-        for i in range(1, 10)
-    }
-    cargo_9001 = cargo.copy()
-    instructions = [instruction.parse(line) for line in instruction_lines]
+def parse_instructions(instruction_str: str):
+    # every line is 'move <amt> from <idx> to <idx>', so the numbers simply come in threes
+    numbers = extract_ints(instruction_str, signed=False)
+    return list(zip(numbers[0::3], numbers[1::3], numbers[2::3]))
+
+
+def parse_instructions_parsy(instruction_str: str):
+    return [instruction().parse(line) for line in instruction_str.splitlines(True)]
+
+
+def iter_instructions(lines):
+    # one instruction per line as it is read, for a stream of any length
+    for line in lines:
+        words = line.split()
+        if words:
+            yield int(words[1]), int(words[3]), int(words[5])
+
+
+def parse_cargo(header_lines):
+    # the last line labels the stacks, the lines above hold the crates, stack i in column 4 * i + 1.
+    # stack count and height follow from the header, lines may lack their trailing spaces
+    *crate_lines, label_line = header_lines
+    labels = [int(label) for label in label_line.split()]
+    cargo = {label: [] for label in labels}  # bottom crate first
+    for line in reversed(crate_lines):
+        for label, crate in zip(labels, line[1::4]):
+            if crate != ' ':
+                cargo[label].append(crate)
+    return cargo
+
+
+def read_cargo(lines):
+    # takes the header off lines, up to and including the blank line ending it
+    header_lines = []
+    for line in lines:
+        line = line.rstrip('\r\n')
+        if not line.strip():
+            break
+        header_lines.append(line)
+    return parse_cargo(header_lines)
+
+
+def parse(the_input):
+    lines = iter(the_input.splitlines(True))
+    cargo = read_cargo(lines)
+    return cargo, parse_instructions(''.join(lines))
+
+
+def copy_cargo(cargo):
+    # apply_instruction changes the stacks themselves, a copy of the dict alone would share them
+    return {i: stack.copy() for i, stack in cargo.items()}
+
+
+def top_crates(cargo):
+    return ''.join((stack[-1] for stack in cargo.values() if stack))
+
+
+def run_crane(cargo, instructions, reverse=True):
+    cargo = copy_cargo(cargo)
     for instr in instructions:
-        apply_instruction(cargo, instr)
-    print(''.join((stack[0] for stack in cargo.values())))
+        apply_instruction(cargo, instr, reverse=reverse)
+    return top_crates(cargo)
+
+
+def run_both_cranes(cargo, instructions):
+    # the 9000 and the 9001 side by side in a single pass, so instructions can be any one-shot iterable
+    cargo_9000, cargo_9001 = copy_cargo(cargo), copy_cargo(cargo)
     for instr in instructions:
+        apply_instruction(cargo_9000, instr)
         apply_instruction(cargo_9001, instr, reverse=False)
-    print(''.join((stack[0] for stack in cargo_9001.values())))
+    return top_crates(cargo_9000), top_crates(cargo_9001)
+
+
+def part1(parsed):
+    return run_crane(*parsed)
+
+
+def part2(parsed):
+    return run_crane(*parsed, reverse=False)
+
+
+def main():
+    # only the crates are held in memory, the instructions are applied as they are read
+    with open_input(input_source(5)) as stream:
+        for answer in run_both_cranes(read_cargo(stream), iter_instructions(stream)):
+            print(answer)
 
 
 if __name__ == '__main__':
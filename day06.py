@@ -1,21 +1,80 @@
+from loader import input_source, open_input
+
+
+class MarkerDetector:
+    # finds the first window of each size whose characters are all distinct, in one pass over a packet fed
+    # in pieces of any size, as they arrive. for every byte value it keeps where it was last seen, so the
+    # run of distinct characters ending at the current one only ever moves forward: O(1) per character
+    __slots__ = ('pending', 'last_seen', 'run_start', 'position', 'found')
+
+    def __init__(self, sizes=(4, 14)):
+        self.pending = sorted(set(sizes), reverse=True)  # smallest last
+        self.last_seen = [-1] * 256
+        self.run_start = 0
+        self.position = 0  # the number of characters fed so far
+        self.found = {}  # window size to marker index, the number of characters up to the end of the window
+
+    def done(self) -> bool:
+        return not self.pending
+
+    def feed(self, data):
+        # returns as soon as every marker is found, without reading the rest
+        if isinstance(data, str):
+            data = data.encode()
+        pending, last_seen, run_start, position = self.pending, self.last_seen, self.run_start, self.position
+        for byte in data:
+            if last_seen[byte] >= run_start:
+                run_start = last_seen[byte] + 1
+            last_seen[byte] = position
+            position += 1
+            while pending and position - run_start >= pending[-1]:
+                self.found[pending.pop()] = position
+            if not pending:
+                break
+        self.run_start, self.position = run_start, position
+
+
 def find_marker_index(packet, num_distinct=4):
-    for i in range(len(packet) - num_distinct):
-        if len(set(packet[i:i+num_distinct])) == num_distinct:
-            return i + num_distinct
+    detector = MarkerDetector((num_distinct,))
+    detector.feed(packet)
+    return detector.found.get(num_distinct)
+
+
+def find_markers_in_stream(stream, sizes=(4, 14), chunk_size=1 << 16):
+    # the marker index for each window size, reading the packet a chunk at a time and stopping once all are
+    # found. markers spanning two chunks need nothing special, the detector carries its state over
+    detector = MarkerDetector(sizes)
+    for chunk in iter(lambda: stream.read(chunk_size), ''):
+        detector.feed(chunk.rstrip('\r\n'))
+        if detector.done():
+            break
+    return [detector.found.get(size) for size in sizes]
+
+
+def parse(the_input):
+    return the_input.strip()
+
+
+def part1(packet):
+    return find_marker_index(packet)
+
+
+def part2(packet):
+    return find_marker_index(packet, 14)
 
 
 def main():
-    with open('input/day06_input.txt') as f:
-        packet = ''.join(f.readlines()).strip()
+    with open_input(input_source(6)) as stream:
+        answer1, answer2 = find_markers_in_stream(stream)
     print(find_marker_index('mjqjpqmgbljsphdztnvjfqwrcgsmlb'))
     print(find_marker_index('bvwbjplbgvbhsrlpgdmjqwftvncz'))
     print(find_marker_index('zcfzfwzzqfrljwzlrfnpqdbhtmscgvjw'))
-    print(find_marker_index(packet))
+    print(answer1)
     print()
     print(find_marker_index('mjqjpqmgbljsphdztnvjfqwrcgsmlb', 14))
     print(find_marker_index('bvwbjplbgvbhsrlpgdmjqwftvncz', 14))
     print(find_marker_index('zcfzfwzzqfrljwzlrfnpqdbhtmscgvjw', 14))
-    print(find_marker_index(packet, 14))
+    print(answer2)
 
 
 if __name__ == '__main__':
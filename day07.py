@@ -1,92 +1,226 @@
-from typing import Dict, List
+from typing import Dict, List, Iterable, Optional
+from bisect import bisect_left, insort
 
-from attrs import define
+from attrs import define, field, Factory
+
+from loader import input_source, open_input
 
 
 @define
 class Directory:
-    subdirs: Dict[str, 'Directory']
-    files: Dict[str, int]
-    _size: int = -1
+    parent: Optional['Directory'] = field(default=None, eq=False, repr=False)
+    subdirs: Dict[str, 'Directory'] = Factory(dict)
+    files: Dict[str, int] = Factory(dict)
+    files_total: int = 0  # of the files right in this directory
+    total: int = 0  # of all files below, only valid once the file system computed the totals
+
+    def dir_iter(self):
+        # an explicit stack rather than recursion, which a deep tree would take past the recursion limit
+        stack = [self]
+        while stack:
+            the_dir = stack.pop()
+            stack.extend(the_dir.subdirs.values())
+            yield the_dir
+
+
+SIZE_BUCKET_LOAD = 256
+
 
-    def get_rec_subdir(self, path_list: List[str]) -> 'Directory':
-        if not path_list:
-            return self
+@define
+class SizeIndex:
+    # the sizes of all directories, sorted, in buckets of up to 2 * SIZE_BUCKET_LOAD the way a sorted list
+    # container keeps them. an update bisects the bucket maxima and only shifts within its bucket, so it
+    # costs O(log n + SIZE_BUCKET_LOAD) rather than moving the whole list
+    buckets: List[List[int]] = Factory(list)
+    maxes: List[int] = Factory(list)
+    sums: List[int] = Factory(list)
+
+    def add(self, size: int):
+        if not self.buckets:
+            self.buckets.append([size])
+            self.maxes.append(size)
+            self.sums.append(size)
+            return
+        i = min(bisect_left(self.maxes, size), len(self.buckets) - 1)
+        bucket = self.buckets[i]
+        insort(bucket, size)
+        self.maxes[i] = bucket[-1]
+        self.sums[i] += size
+        if len(bucket) > 2 * SIZE_BUCKET_LOAD:
+            half = bucket[SIZE_BUCKET_LOAD:]
+            del bucket[SIZE_BUCKET_LOAD:]
+            self.buckets.insert(i + 1, half)
+            self.maxes[i:i + 1] = [bucket[-1], half[-1]]
+            self.sums[i:i + 1] = [sum(bucket), sum(half)]
+
+    def remove(self, size: int):
+        i = bisect_left(self.maxes, size)
+        bucket = self.buckets[i]
+        del bucket[bisect_left(bucket, size)]
+        if bucket:
+            self.maxes[i] = bucket[-1]
+            self.sums[i] -= size
         else:
-            return self.subdirs[path_list[0]].get_rec_subdir(path_list[1:])
+            del self.buckets[i], self.maxes[i], self.sums[i]
 
-    def extend_with(self, subdirnames: List[str], files: Dict[str, int]):
-        self.files = files
-        self.subdirs = {name: Directory({}, {}) for name in subdirnames}
+    def replace(self, old_size: int, new_size: int):
+        self.remove(old_size)
+        self.add(new_size)
 
-    def size(self):
-        if self._size == -1:
-            self._size = sum((subdir.size() for subdir in self.subdirs.values())) + sum(self.files.values())
-        return self._size
+    def sizes(self) -> List[int]:
+        return [size for bucket in self.buckets for size in bucket]
 
-    def dir_iter(self):
-        for subdir in self.subdirs.values():
-            yield from subdir.dir_iter()
-        yield self
+    def sum_below(self, limit: int) -> int:
+        i = bisect_left(self.maxes, limit)  # every bucket before i lies below limit as a whole
+        total = sum(self.sums[:i])
+        if i < len(self.buckets):
+            bucket = self.buckets[i]
+            total += sum(bucket[:bisect_left(bucket, limit)])
+        return total
+
+    def smallest_at_least(self, limit: int) -> Optional[int]:
+        i = bisect_left(self.maxes, limit)
+        if i == len(self.buckets):
+            return None
+        bucket = self.buckets[i]
+        return bucket[bisect_left(bucket, limit)]
+
+
+def build_size_index(sizes: Iterable[int]) -> SizeIndex:
+    sizes = sorted(sizes)
+    buckets = [sizes[i:i + SIZE_BUCKET_LOAD] for i in range(0, len(sizes), SIZE_BUCKET_LOAD)]
+    return SizeIndex(buckets, [bucket[-1] for bucket in buckets], [sum(bucket) for bucket in buckets])
 
 
 @define
-class IntermediateTerminalState:
-    line_idx: int
-    working_dir: List[str]
-
-    def read_command(self, terminal_lines: List[str], root_dir: Directory):
-        cmd = terminal_lines[self.line_idx].strip()
-        assert(cmd[0] == '$')
-        if cmd[2:4] == 'cd':
-            the_dir = cmd[5:]
+class FileSystem:
+    # every change goes through here. a bulk replay only keeps the file sum of each directory itself, the
+    # totals follow in one pass over the tree when a size is first asked for. from then on a file changes
+    # the total of its directory and of all directories above it by the same delta, which gets pushed up
+    # the parents, and into the size index once that got built on its first query
+    root: Directory = Factory(Directory)
+    _totals_ready: bool = False
+    _index: Optional[SizeIndex] = None
+
+    def compute_totals(self):
+        # children come after their parent in dir_iter, so in reverse every subdir is done before its parent
+        for the_dir in reversed(list(self.root.dir_iter())):
+            the_dir.total = the_dir.files_total + sum((subdir.total for subdir in the_dir.subdirs.values()))
+        self._totals_ready = True
+
+    def size(self, the_dir: Directory) -> int:
+        if not self._totals_ready:
+            self.compute_totals()
+        return the_dir.total
+
+    def size_index(self) -> SizeIndex:
+        if self._index is None:
+            if not self._totals_ready:
+                self.compute_totals()
+            self._index = build_size_index((the_dir.total for the_dir in self.root.dir_iter()))
+        return self._index
+
+    def make_dir(self, parent: Directory, name: str) -> Directory:
+        if name not in parent.subdirs:
+            parent.subdirs[name] = Directory(parent)
+            if self._index is not None:
+                self._index.add(0)
+        return parent.subdirs[name]
+
+    def remove_dir(self, parent: Directory, name: str):
+        removed = parent.subdirs.pop(name)
+        if self._index is not None:
+            for the_dir in removed.dir_iter():
+                self._index.remove(the_dir.total)
+        if self._totals_ready:
+            self.push_delta(parent, -removed.total)
+
+    def add_file(self, the_dir: Directory, name: str, size: int):
+        # or change its size, when it is already there
+        self.change_files_total(the_dir, size - the_dir.files.get(name, 0))
+        the_dir.files[name] = size
+
+    def remove_file(self, the_dir: Directory, name: str):
+        self.change_files_total(the_dir, -the_dir.files.pop(name))
+
+    def change_files_total(self, the_dir: Directory, delta: int):
+        the_dir.files_total += delta
+        if self._totals_ready:
+            self.push_delta(the_dir, delta)
+
+    def push_delta(self, the_dir: Optional[Directory], delta: int):
+        if not delta:
+            return
+        while the_dir is not None:
+            if self._index is not None:
+                self._index.replace(the_dir.total, the_dir.total + delta)
+            the_dir.total += delta
+            the_dir = the_dir.parent
+
+
+@define
+class TerminalReplay:
+    # the directories from the root down to the working one, as the nodes themselves. cd pushes or pops a
+    # node and listed entries go straight into the last one, no path gets looked up again
+    file_system: FileSystem
+    dir_stack: List[Directory]
+
+    def read_line(self, line: str):
+        line = line.strip()
+        if not line:
+            return
+        cur_dir = self.dir_stack[-1]
+        if line.startswith('$ cd '):
+            the_dir = line[5:]
             if the_dir == '/':
-                self.working_dir = []
+                del self.dir_stack[1:]
             elif the_dir == '..':
-                self.working_dir = self.working_dir[:-1]
+                if len(self.dir_stack) > 1:
+                    self.dir_stack.pop()
             else:
-                self.working_dir.append(the_dir)
-            self.line_idx += 1
-        elif cmd[2:4] == 'ls':
-            self.line_idx += 1
-            sub_dirs = []
-            files = dict()
-            while (self.line_idx < len(terminal_lines) and
-                   terminal_lines[self.line_idx].strip() and
-                   terminal_lines[self.line_idx][0] != '$'):
-                output_line = terminal_lines[self.line_idx].strip()
-                if output_line.startswith('dir'):
-                    sub_dirs.append(output_line[4:])
-                else:
-                    size, name = tuple(output_line.split(' '))
-                    files[name] = int(size)
-                self.line_idx += 1
-            cur_dir = root_dir.get_rec_subdir(self.working_dir)
-            cur_dir.extend_with(sub_dirs, files)
+                self.dir_stack.append(self.file_system.make_dir(cur_dir, the_dir))
+        elif line[0] == '$':
+            if line[2:4] != 'ls':  # the listing itself follows on the next lines
+                print(line[2:4])
+        elif line.startswith('dir '):
+            self.file_system.make_dir(cur_dir, line[4:])
         else:
-            print(cmd[2:4])
+            size, name = line.split(' ')
+            self.file_system.add_file(cur_dir, name, int(size))
 
 
-def parse_terminal(root_dir: Directory, terminal: str):
-    lines = terminal.split('\n')[:-1]
-    state = IntermediateTerminalState(0, [])
-    while state.line_idx < len(lines):
-        state.read_command(lines, root_dir)
+def replay_terminal(file_system: FileSystem, lines: Iterable[str]):
+    # lines can be any iterable, an open log file is replayed as it is read
+    replay = TerminalReplay(file_system, [file_system.root])
+    for line in lines:
+        replay.read_line(line)
 
 
-def main():
-    with open('input/day07_input.txt') as f:
-        terminal = ''.join(f.readlines())
-    root_dir = Directory({}, {})
-    parse_terminal(root_dir, terminal)
+def parse(the_input: str) -> FileSystem:
+    file_system = FileSystem()
+    replay_terminal(file_system, the_input.splitlines())
+    return file_system
+
 
-    print(sum((subdir.size() for subdir in root_dir.dir_iter() if subdir.size() < 100000)))
+def part1(file_system: FileSystem):
+    return file_system.size_index().sum_below(100000)
+
+
+def part2(file_system: FileSystem):
     total_space = 70000000
     required_space = 30000000
-    taken_space = root_dir.size()
+    taken_space = file_system.size(file_system.root)
     unused_space = total_space - taken_space
     delete_at_least = required_space - unused_space
-    print(min((subdir.size() for subdir in root_dir.dir_iter() if subdir.size() >= delete_at_least)))
+    return file_system.size_index().smallest_at_least(delete_at_least)
+
+
+def main():
+    file_system = FileSystem()
+    with open_input(input_source(7)) as stream:
+        replay_terminal(file_system, stream)
+    print(part1(file_system))
+    print(part2(file_system))
 
 
 if __name__ == '__main__':
@@ -1,45 +1,97 @@
-from typing import List, Tuple
-from math import prod
+from typing import Iterator, List
 
+from grid import Grid, grid_from_str
+from loader import input_source, read_input
 
-def get_visible_trees(i, j, grid: List[List[int]]) -> Tuple[List[int], List[int], List[int], List[int]]:
-    above = list(reversed([grid[k][j] for k in range(i)]))
-    below = [grid[k][j] for k in range(i+1, len(grid))]
-    left = list(reversed([grid[i][k] for k in range(j)]))
-    right = [grid[i][k] for k in range(j+1, len(grid[i]))]
-    return above, below, left, right
 
+DIGITS = {str(height): height for height in range(10)}
+# from this many trees on, part 1 takes the numpy path when numpy is installed. below it, importing
+# numpy costs more than the sweeps themselves
+NUMPY_MIN_CELLS = 1 << 20
 
-def is_visible_in(i, j, grid: List[List[int]]):
-    if i == 0 or j == 0 or i == len(grid) - 1 or j == len(grid[i]) - 1:
-        return True
-    height = grid[i][j]
-    min_view_dist = min(map(max, list(get_visible_trees(i, j, grid))))
-    return min_view_dist < height
 
+def sight_lines(grid: Grid) -> Iterator[range]:
+    # the flat indices of every row and column, in both directions. each tree is on four of them
+    rows, cols = grid.rows, grid.cols
+    for i in range(rows):
+        yield range(i * cols, (i + 1) * cols)
+        yield range((i + 1) * cols - 1, i * cols - 1, -1)
+    for j in range(cols):
+        yield range(j, rows * cols, cols)
+        yield range((rows - 1) * cols + j, j - 1, -cols)
 
-def calc_view_dist(height, trees: List[int]):
-    view_dist = 0
-    for tree in trees:
-        view_dist += 1
-        if tree >= height:
-            break
-    return view_dist
 
+def visibility_mask(grid: Grid) -> bytearray:
+    # a tree is visible along a line when it is higher than the running maximum before it: four sweeps
+    # over the grid, O(1) per tree and sweep
+    cells = grid.cells
+    visible = bytearray(len(cells))
+    for line in sight_lines(grid):
+        highest = -1
+        for idx in line:
+            if cells[idx] > highest:
+                visible[idx] = 1
+                highest = cells[idx]
+                if highest == 9:  # nothing further along can be seen
+                    break
+    return visible
 
-def calc_scenic_score(i, j, grid: List[List[int]]):
-    height = grid[i][j]
-    return prod((calc_view_dist(height, trees) for trees in get_visible_trees(i, j, grid)))
+
+def visibility_mask_numpy(grid: Grid):
+    # the same four sweeps as whole-array running maxima, for forests too large to walk tree by tree
+    import numpy as np  # optional, and slow to import
+    heights = np.frombuffer(grid.cells, dtype=np.uint8).reshape(grid.rows, grid.cols).astype(np.int8)
+    visible = np.zeros(heights.shape, dtype=bool)
+    for flip, axis in ((False, 1), (True, 1), (False, 0), (True, 0)):
+        view = np.flip(heights, axis) if flip else heights
+        before = np.full(view.shape, -1, dtype=np.int8)  # the highest tree before each one, -1 at the edge
+        if axis == 1:
+            before[:, 1:] = np.maximum.accumulate(view, axis=1)[:, :-1]
+        else:
+            before[1:, :] = np.maximum.accumulate(view, axis=0)[:-1, :]
+        seen = view > before
+        visible |= np.flip(seen, axis) if flip else seen
+    return visible
+
+
+def scenic_scores(grid: Grid) -> List[int]:
+    # the viewing distance back along a line ends at the nearest tree at least as high. a stack of the
+    # positions of trees not yet blocked by a higher or equal one finds it, every tree is pushed and
+    # popped at most once per sweep
+    cells = grid.cells
+    scores = [1] * len(cells)
+    for line in sight_lines(grid):
+        stack = []
+        for pos, idx in enumerate(line):
+            height = cells[idx]
+            while stack and cells[line[stack[-1]]] < height:
+                stack.pop()
+            scores[idx] *= pos - stack[-1] if stack else pos
+            stack.append(pos)
+    return scores
+
+
+def parse(the_input: str) -> Grid:
+    return grid_from_str(the_input.strip(), DIGITS)
+
+
+def part1(grid: Grid):
+    if len(grid) >= NUMPY_MIN_CELLS:
+        try:
+            return int(visibility_mask_numpy(grid).sum())
+        except ImportError:
+            pass
+    return sum(visibility_mask(grid))
+
+
+def part2(grid: Grid):
+    return max(scenic_scores(grid))
 
 
 def main():
-    with open('input/day08_input.txt') as f:
-        grid = [list(map(int, line.strip())) for line in f.readlines()]
-    print(grid)
-    print(len(grid))
-    print(len(grid[0]))
-    print(sum((1 for i in range(len(grid)) for j in range(len(grid[0])) if is_visible_in(i, j, grid))))
-    print(max((calc_scenic_score(i, j, grid) for i in range(len(grid)) for j in range(len(grid[0])))))
+    grid = parse(read_input(input_source(8)))
+    print(part1(grid))
+    print(part2(grid))
 
 
 if __name__ == '__main__':
@@ -1,82 +1,85 @@
-from typing import Tuple, Dict, List
-from collections import defaultdict
+from typing import Dict, Tuple, List, Set
+from bisect import bisect_left, bisect_right
 
-from attrs import define
+from loader import input_source, read_input
 
 
-@define
-class Position:
-    x: int
-    y: int
+Move = Tuple[int, int, int]  # dx, dy, amt
 
-    def __add__(self, other):
-        return Position(self.x + other.x, self.y + other.y)
+DIRECTIONS = {'L': (-1, 0), 'R': (1, 0), 'U': (0, 1), 'D': (0, -1)}
 
-    def __hash__(self):
-        return hash((self.x, self.y))
+# a cell as the int x * VISIT_STRIDE + y, unique while |y| < VISIT_STRIDE / 2, so visited sets hold ints
+VISIT_STRIDE = 1 << 32
+HALF_STRIDE = VISIT_STRIDE // 2
 
-    def __mul__(self, other: int):
-        return Position(self.x * other, self.y * other)
+Interval = Tuple[int, int]  # first and last cell, inclusive
 
 
-Left = Position(-1, 0)
-Right = Position(1, 0)
-Up = Position(0, 1)
-Down = Position(0, -1)
+def unpack_cell(packed: int) -> Tuple[int, int]:
+    x, y = divmod(packed + HALF_STRIDE, VISIT_STRIDE)
+    return x, y - HALF_STRIDE
 
 
-def compute_new_tail_pos(new_head_pos: Position, old_tail_pos: Position) -> Position:
-    tail_move = Position(0, 0)
-    x_diff = new_head_pos.x - old_tail_pos.x
-    y_diff = new_head_pos.y - old_tail_pos.y
-    if abs(x_diff) > 1 or abs(y_diff) > 1:
-        tail_move.x += x_diff / abs(x_diff) if x_diff else 0
-        tail_move.y += y_diff / abs(y_diff) if y_diff else 0
-    return old_tail_pos + tail_move
+def merge_intervals(intervals: List[Interval]) -> List[Interval]:
+    # sorted, and touching or overlapping intervals joined
+    merged = []
+    for first, last in sorted(intervals):
+        if merged and first <= merged[-1][1] + 1:
+            if last > merged[-1][1]:
+                merged[-1] = (merged[-1][0], last)
+        else:
+            merged.append((first, last))
+    return merged
 
 
-def propagate_rope_move(head: Position, tail: List[Position]) -> List[Position]:
-    if not tail:
-        return tail
-    else:
-        tail_move = Position(0, 0)
-        old_tail_pos = tail[0]
-        x_diff = head.x - old_tail_pos.x
-        y_diff = head.y - old_tail_pos.y
-        if abs(x_diff) > 1 or abs(y_diff) > 1:
-            tail_move.x += x_diff / abs(x_diff) if x_diff else 0
-            tail_move.y += y_diff / abs(y_diff) if y_diff else 0
-        new_tail_pos = old_tail_pos + tail_move
-        return [new_tail_pos] + propagate_rope_move(new_tail_pos, tail[1:])
+class Visits:
+    # the cells a knot visited: the ones it reached step by step, and the straight runs it made in one go,
+    # which are kept as segments however long they are
+    __slots__ = ('cells', 'segments')
 
+    def __init__(self):
+        self.cells: Set[int] = {0}
+        self.segments: List[Tuple[int, int, int, int, int]] = []  # x, y, dx, dy, length, excluding (x, y)
 
-def move_rope(rope: List[Position], direction: Position) -> List[Position]:
-    new_head = rope[0] + direction
-    return [new_head] + propagate_rope_move(new_head, rope[1:])
+    def add(self, packed: int):
+        self.cells.add(packed)
 
+    def add_segment(self, x: int, y: int, dx: int, dy: int, length: int):
+        self.segments.append((x, y, dx, dy, length))
 
-def register_move(visit_dict: Dict[Position, bool], rope: List[Position], direction: Position)\
-        -> Tuple[Position, Position]:
-    new_rope = move_rope(rope, direction)
-    visit_dict[new_rope[-1]] = True
-    return new_rope
+    def __len__(self):
+        # cells and horizontal segments become intervals per row, vertical segments intervals per column.
+        # after merging both, a cell covered by a row and a column interval got counted twice
+        rows: Dict[int, List[Interval]] = {}
+        cols: Dict[int, List[Interval]] = {}
+        for packed in self.cells:
+            x, y = unpack_cell(packed)
+            rows.setdefault(y, []).append((x, x))
+        for x, y, dx, dy, length in self.segments:
+            if dy == 0:
+                rows.setdefault(y, []).append((min(x + dx, x + dx * length), max(x + dx, x + dx * length)))
+            else:
+                cols.setdefault(x, []).append((min(y + dy, y + dy * length), max(y + dy, y + dy * length)))
+        rows = {y: merge_intervals(intervals) for y, intervals in rows.items()}
+        row_keys = sorted(rows)
+        count = sum((last - first + 1 for intervals in rows.values() for first, last in intervals))
+        for x, intervals in cols.items():
+            for first, last in merge_intervals(intervals):
+                count += last - first + 1
+                for y in row_keys[bisect_left(row_keys, first):bisect_right(row_keys, last)]:
+                    i = bisect_right(rows[y], (x, float('inf'))) - 1
+                    if i >= 0 and rows[y][i][1] >= x:
+                        count -= 1
+        return count
 
 
-def parse_move(move_line: str) -> Tuple[Position, int]:
-    move_str, amt_str = tuple(move_line.strip().split(' '))
-    amt = int(amt_str)
-    if move_str == 'L':
-        return Left, amt
-    elif move_str == 'R':
-        return Right, amt
-    elif move_str == 'U':
-        return Up, amt
-    elif move_str == 'D':
-        return Down, amt
+def parse_move(move_line: str) -> Move:
+    move_str, amt_str = move_line.split()
+    return *DIRECTIONS[move_str], int(amt_str)
 
 
-def parse_moves(move_lines: str) -> List[Tuple[Position, int]]:
-    return [parse_move(line) for line in move_lines.splitlines()]
+def parse_moves(move_lines: str) -> List[Move]:
+    return [parse_move(line) for line in move_lines.splitlines() if line.strip()]
 
 
 TEST_MOVES1 = '''R 4
@@ -98,26 +101,66 @@ L 25
 U 20'''
 
 
-def make_rope(rope_len):
-    return [Position(0, 0) for _ in range(rope_len)]
+def is_taut(knots: List[int], dx: int, dy: int) -> bool:
+    # every knot right behind the one before it, in the direction of the move
+    return all((knots[k - 2] - knots[k] == dx and knots[k - 1] - knots[k + 1] == dy
+                for k in range(2, len(knots), 2)))
+
+
+def simulate_rope(moves: List[Move], rope_len: int) -> List[Visits]:
+    # the cells every knot visits, for all knots in one simulation: knot k of the rope follows the same
+    # path as the tail of a rope of k + 1 knots. the knots live in one flat list, x of knot k at 2 * k and
+    # y at 2 * k + 1, and a step only propagates until a knot stays where it is, the rest stays too.
+    # once a step moved every knot and left the rope taut in a straight line, each further step of the
+    # move shifts the whole rope by one, so the rest of the move is done at once
+    knots = [0] * (2 * rope_len)
+    visited = [Visits() for _ in range(rope_len)]
+    for dx, dy, amt in moves:
+        for step in range(1, amt + 1):
+            knots[0] += dx
+            knots[1] += dy
+            visited[0].add(knots[0] * VISIT_STRIDE + knots[1])
+            for k in range(2, 2 * rope_len, 2):
+                x_diff = knots[k - 2] - knots[k]
+                y_diff = knots[k - 1] - knots[k + 1]
+                if -1 <= x_diff <= 1 and -1 <= y_diff <= 1:
+                    break
+                knots[k] += (x_diff > 0) - (x_diff < 0)
+                knots[k + 1] += (y_diff > 0) - (y_diff < 0)
+                visited[k // 2].add(knots[k] * VISIT_STRIDE + knots[k + 1])
+            else:
+                if step < amt and is_taut(knots, dx, dy):
+                    remaining = amt - step
+                    for k in range(0, 2 * rope_len, 2):
+                        visited[k // 2].add_segment(knots[k], knots[k + 1], dx, dy, remaining)
+                        knots[k] += dx * remaining
+                        knots[k + 1] += dy * remaining
+                    break
+    return visited
+
+
+def count_tail_visits(moves: List[Move], rope_len: int) -> int:
+    return len(simulate_rope(moves, rope_len)[-1])
+
+
+def parse(the_input: str) -> List[Move]:
+    return parse_moves(the_input)
+
+
+def part1(moves: List[Move]):
+    return count_tail_visits(moves, 2)
+
+
+def part2(moves: List[Move]):
+    return count_tail_visits(moves, 10)
 
 
 def main():
-    with open('input/day09_input.txt') as f:
-        moves_str = ''.join(f.readlines())
+    moves_str = read_input(input_source(9))
     # moves_str = TEST_MOVES2
-    moves = parse_moves(moves_str)
-    visit_dict = defaultdict(lambda _: False)
-    rope_pt1 = make_rope(2)
-    for move, amt in moves:
-        for i in range(amt):
-            rope_pt1 = register_move(visit_dict, rope_pt1, move)
-    visit_dict = defaultdict(lambda _: False)
-    rope_pt2 = make_rope(10)
-    for move, amt in moves:
-        for i in range(amt):
-            rope_pt2 = register_move(visit_dict, rope_pt2, move)
-    print(sum((1 for val in visit_dict.values() if val)))
+    visited = simulate_rope(parse(moves_str), 10)
+    print(len(visited[1]))
+    print(len(visited[9]))
 
 
 if __name__ == '__main__':
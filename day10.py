@@ -1,7 +1,9 @@
-from typing import Optional, Dict, List
+from typing import Callable, Optional, Dict, List, Iterable, Iterator
 
 from attrs import define
 
+from loader import input_source, open_input
+
 
 def parse_line(line) -> Optional[int]:
     if line == 'noop':
@@ -37,6 +39,16 @@ def run_instr(state: CPUState, trace: Dict[int, int], instr: Optional[int]):
         state.X += instr
 
 
+def cycle_values(instrs: Iterable[Optional[int]]) -> Iterator[int]:
+    # X during each cycle, from the first one on, without keeping a trace
+    X = 1
+    for instr in instrs:
+        yield X
+        if instr is not None:
+            yield X
+            X += instr
+
+
 def execute(state: CPUState, instrs: List[Optional[int]]):
     trace = {}
     for instr in instrs:
@@ -200,19 +212,48 @@ def trace_to_screen(trace: Dict[int, int]) -> Dict[int, bool]:
 
 
 def screen_to_string(screen: Dict[int, bool]) -> str:
-    long_str = ''.join(('#' if lit else '.' for lit in screen.values()))
+    return pixels_to_string(screen.values())
+
+
+def pixels_to_string(pixels: Iterable[bool]) -> str:
+    long_str = ''.join(('#' if lit else '.' for lit in pixels))
     return '\n'.join((long_str[i * 40:(i + 1) * 40] for i in range(len(long_str) // 40)))
 
 
-def main():
-    with open('input/day10_input.txt') as f:
-        instrs = [parse_line(line.strip()) for line in f.readlines()]
-    # instrs = [parse_line(line.strip()) for line in test_instrs.splitlines()]
-    # print(instrs)
+def parse(the_input: str) -> List[Optional[int]]:
+    return [parse_line(line.strip()) for line in the_input.splitlines()]
+
+
+def part1(instrs: List[Optional[int]]):
     trace = execute(CPUState(), instrs)
-    print(sum(trace[20 + i * 40] * (20 + i * 40) for i in range(6)))
-    print(trace)
-    print(screen_to_string(trace_to_screen(trace)))
+    return sum(trace[20 + i * 40] * (20 + i * 40) for i in range(6))
+
+
+def part2(instrs: List[Optional[int]]):
+    return screen_to_string(trace_to_screen(execute(CPUState(), instrs)))
+
+
+def solve_stream(stream, emit_row: Callable[[str], None]):
+    # both parts cycle by cycle while the instructions are read. every row of the screen goes to emit_row
+    # as soon as its 40 pixels are drawn, so only the current row is kept. returns the signal strength
+    strength = 0
+    pixels = []
+    instrs = (parse_line(line.strip()) for line in stream if line.strip())
+    for cycle, X in enumerate(cycle_values(instrs), 1):
+        if cycle % 40 == 20 and cycle <= 220:
+            strength += cycle * X
+        pixels.append(abs(X - ((cycle - 1) % 40)) <= 1)
+        if len(pixels) == 40:
+            emit_row(pixels_to_string(pixels))
+            pixels = []
+    return strength
+
+
+def main():
+    with open_input(input_source(10)) as stream:
+        # instrs = parse(test_instrs)
+        strength = solve_stream(stream, print)  # the screen comes first, row by row
+    print(strength)
 
 
 if __name__ == '__main__':
@@ -1,7 +1,9 @@
 from typing import List, Callable
 from itertools import product
 
-from attrs import define
+from attrs import define, evolve
+
+from loader import input_source, read_input
 
 
 @define
@@ -57,14 +59,57 @@ def gen_input_monkeys() -> List[Monkey]:
     ]
 
 
-def main():
-    test_monks = gen_input_monkeys()
+def parse_op(op_str: str) -> Callable[[int], int]:
+    left, op, right = op_str.split(' ')
+    assert(left == 'old')
+    if right == 'old':
+        return (lambda o: o * o) if op == '*' else (lambda o: o + o)
+    amt = int(right)
+    return (lambda o: o * amt) if op == '*' else (lambda o: o + amt)
+
+
+def parse_monkey(monkey_str: str) -> Monkey:
+    lines = [line.strip() for line in monkey_str.strip().splitlines()]
+    items = [int(item) for item in lines[1][len('Starting items: '):].split(', ') if item]
+    return Monkey(
+        parse_op(lines[2][len('Operation: new = '):]),
+        int(lines[3].split(' ')[-1]),
+        int(lines[4].split(' ')[-1]),
+        int(lines[5].split(' ')[-1]),
+        items
+    )
+
+
+def parse(the_input: str) -> List[Monkey]:
+    return [parse_monkey(monkey_str) for monkey_str in the_input.split('\n\n') if monkey_str.strip()]
+
+
+def copy_monkeys(monkeys: List[Monkey]) -> List[Monkey]:
+    return [evolve(monkey, items=list(monkey.items)) for monkey in monkeys]
+
+
+def part1(monkeys: List[Monkey]):
+    monkeys = copy_monkeys(monkeys)
+    for i in range(20):
+        do_round(monkeys)
+    return monkey_business(monkeys)
+
+
+def part2(monkeys: List[Monkey]):
+    monkeys = copy_monkeys(monkeys)
     divider_prod = 1
-    for monkey in test_monks:
+    for monkey in monkeys:
         divider_prod *= monkey.divider
     for i in range(10000):
-        do_round(test_monks, lambda x: x % divider_prod)
-    print(monkey_business(test_monks))
+        do_round(monkeys, lambda x: x % divider_prod)
+    return monkey_business(monkeys)
+
+
+def main():
+    monkeys = parse(read_input(input_source(11)))
+    # monkeys = gen_input_monkeys()
+    print(part1(monkeys))
+    print(part2(monkeys))
 
 
 if __name__ == '__main__':
@@ -1,4 +1,8 @@
-from typing import Tuple, Dict, List, TypeVar
+from typing import Tuple, List
+
+from graph import bfs
+from grid import Grid, grid_from_str
+from loader import input_source, read_input
 
 
 test_grid = '''Sabqponm
@@ -17,83 +21,54 @@ def to_height_num(the_char):
     return ord(the_char) - ord('a')
 
 
-def read_grid(grid_str: str) -> Dict[Tuple[int, int], int]:
-    return {
-        (i, j): to_height_num(char)
-        for i, line in enumerate(grid_str.splitlines())
-        for j, char in enumerate(line)
-    }
+HEIGHTS = {char: to_height_num(char) for char in 'abcdefghijklmnopqrstuvwxyzSE'}
+
+
+def read_grid(grid_str: str) -> Grid:
+    return grid_from_str(grid_str, HEIGHTS)
 
 
-def find_char(grid_str: str, target: str) -> Tuple[int, int]:
-    for i, line in enumerate(grid_str.splitlines()):
-        for j, char in enumerate(line):
-            if char == target:
-                return i, j
+def find_char(grid_str: str, target: str) -> int:
+    # as a flat index into the grid read from the same string
+    lines = grid_str.splitlines()
+    cols = max((len(line) for line in lines))
+    for i, line in enumerate(lines):
+        j = line.find(target)
+        if j != -1:
+            return i * cols + j
 
 
-def get_visitable_neighbors(grid: Dict[Tuple[int, int], int], i: int, j: int, xlen: int, ylen: int)\
-        -> List[Tuple[int, int]]:
-    result = []
-    height = grid[i, j]
-    if i > 0 and grid[i - 1, j] <= height + 1:
-        result.append((i - 1, j))
-    if i < xlen - 1 and grid[i + 1, j] <= height + 1:
-        result.append((i + 1, j))
-    if j > 0 and grid[i, j - 1] <= height + 1:
-        result.append((i, j - 1))
-    if j < ylen - 1 and grid[i, j + 1] <= height + 1:
-        result.append((i, j + 1))
-    return result
+def get_visitable_neighbors(grid: Grid, idx: int) -> List[int]:
+    max_height = grid.cells[idx] + 1
+    return [neighbor for neighbor in grid.neighbors(idx) if grid.cells[neighbor] <= max_height]
 
 
-def grid_to_graph(grid: Dict[Tuple[int, int], int]) -> Dict[Tuple[int, int], List[Tuple[int, int]]]:
-    xlen = max((x for x, _ in grid.keys())) + 1
-    ylen = max((y for _, y in grid.keys())) + 1
-    return {
-        (i, j): get_visitable_neighbors(grid, i, j, xlen, ylen)
-        for i, j in grid.keys()
-    }
+def shortest_climb(grid: Grid, starts: List[int], end: int) -> int:
+    result = bfs(starts, lambda idx: get_visitable_neighbors(grid, idx), is_target=lambda idx: idx == end)
+    return result.target_dist()
 
 
-def read_graph(grid_str: str) -> Tuple[Dict[Tuple[int, int], List[Tuple[int, int]]], Tuple[int, int], Tuple[int, int]]:
-    grid = read_grid(grid_str)
-    start = find_char(grid_str, 'S')
-    end = find_char(grid_str, 'E')
-    return grid_to_graph(grid), start, end
+def parse(grid_str: str) -> Tuple[Grid, int, int]:
+    return read_grid(grid_str), find_char(grid_str, 'S'), find_char(grid_str, 'E')
 
 
-A = TypeVar('A')
+def part1(parsed: Tuple[Grid, int, int]):
+    grid, start, end = parsed
+    return shortest_climb(grid, [start], end)
 
 
-def dijkstra(graph: Dict[A, List[A]], start: A) -> Dict[A, int]:
-    result = {start: 0}
-    new = [start]
-    while new:
-        node = new.pop(0)
-        cost = result[node]
-        for neigbor in graph[node]:
-            if neigbor not in result or result[neigbor] > cost + 1:
-                result[neigbor] = cost + 1
-                new.append(neigbor)
-    return result
+def part2(parsed: Tuple[Grid, int, int]):
+    grid, _, end = parsed
+    # searching from all lowest squares at once gives the distance from the closest one
+    return shortest_climb(grid, list(grid.indices_of(0)), end)
 
 
 def main():
-    with open('input/day12_input.txt') as f:
-        input_grid = f.read()
+    input_grid = read_input(input_source(12))
     the_grid = input_grid
-    graph, start, end = read_graph(the_grid)
-    dists = dijkstra(graph, start)
-    print(dists[end])
-    grid = read_grid(the_grid)
-    min_dists = [
-        dijkstra(graph, adr)[end] if end in dijkstra(graph, adr) else 999
-        # bloody inefficient but apparently fine
-        for adr, height in grid.items()
-        if height == 0
-    ]
-    print(min(min_dists))
+    parsed = parse(the_grid)
+    print(part1(parsed))
+    print(part2(parsed))
 
 
 if __name__ == '__main__':
@@ -1,22 +1,23 @@
-from typing import Dict, Tuple, List
-from collections import defaultdict
+from typing import List
 
+from coords import Coord
+from grid import Grid, make_grid
+from loader import input_source, read_input
 
-Coord = Tuple[int, int]
 
-# populate a dictionary with rock monoliths. no need to store whether sand or rock
+# populate a grid with rock monoliths. no need to store whether sand or rock
 # get lowest rock monolith
 # simulate sand falling until stopped or lower than lowest rock monolith
+# sand spreads at most one column per row it falls, so the grid only needs to be as wide as it is deep
 
 
-def add_from_to(start: Coord, end: Coord, grid: Dict[Coord, bool]):
-    xdiff = end[0] - start[0]
-    ydiff = end[1] - start[1]
-    xstep = xdiff // abs(xdiff) if xdiff else 0
-    ystep = ydiff // abs(ydiff) if ydiff else 0
-    for i in range(max(abs(xdiff), abs(ydiff)) + 1):
-        res = start[0] + i * xstep, start[1] + i * ystep
-        grid[res] = True
+def add_from_to(start: Coord, end: Coord, grid: Grid):
+    # rock paths are horizontal or vertical. only the part within the grid's columns gets drawn, sand never
+    # reaches any further out
+    (x1, y1), (x2, y2) = sorted((start, end))
+    for x in range(max(x1, grid.col_offset), min(x2, grid.col_offset + grid.cols - 1) + 1):
+        for y in range(y1, y2 + 1):
+            grid[y, x] = True
 
 
 def parse_input(the_input) -> List[List[Coord]]:
@@ -31,48 +32,63 @@ def parse_input(the_input) -> List[List[Coord]]:
     ]
 
 
-def add_regolith(coords: List[Coord], grid: Dict[Coord, bool]):
+def add_regolith(coords: List[Coord], grid: Grid):
     for start, end in zip(coords[:-1], coords[1:]):
         add_from_to(start, end, grid)
 
 
-def get_initial_grid(regos: List[List[Coord]]):
-    grid = defaultdict(lambda: False)
+def get_lowest_rock(regos: List[List[Coord]]) -> int:
+    return max((y for rego in regos for _, y in rego))
+
+
+def get_initial_grid(regos: List[List[Coord]]) -> Grid:
+    # rows are y, cols are x. room for the part 2 floor, and for sand falling past it
+    lowest = get_lowest_rock(regos)
+    grid = make_grid(lowest + 4, 2 * lowest + 7, col_offset=500 - lowest - 3)
     for rego in regos:
         add_regolith(rego, grid)
     return grid
 
 
-def get_pt2_grid(regos: List[List[Coord]]):
+def get_pt2_grid(regos: List[List[Coord]]) -> Grid:
     grid = get_initial_grid(regos)
-    lowest = max((y for _, y in grid.keys()))
-    for x in range(500 - lowest - 2, 500 + lowest + 2 + 1):
-        grid[x, lowest + 2] = True
+    lowest = get_lowest_rock(regos)
+    for x in range(grid.col_offset, grid.col_offset + grid.cols):
+        grid[lowest + 2, x] = True
     return grid
 
 
-def add_sand(grid: Dict[Coord, bool], lowest: int) -> bool:
-    sandx = 500
+def get_lowest(grid: Grid) -> int:
+    for y in reversed(range(grid.rows)):
+        if any(grid.row_cells(y)):
+            return y + grid.row_offset
+    return grid.row_offset - 1  # no rock within reach, the sand falls straight through
+
+
+def add_sand(grid: Grid, lowest: int) -> bool:
+    cells = grid.cells
+    cols = grid.cols
+    sand = grid.index(0, 500)
     sandy = 0
     while sandy <= lowest:
-        if not grid[sandx, sandy + 1]:
-            sandy += 1
-        elif not grid[sandx - 1, sandy + 1]:
-            sandx -= 1
-            sandy += 1
-        elif not grid[sandx + 1, sandy + 1]:
-            sandx += 1
-            sandy += 1
+        below = sand + cols
+        if not cells[below]:
+            sand = below
+        elif not cells[below - 1]:
+            sand = below - 1
+        elif not cells[below + 1]:
+            sand = below + 1
         else:
-            taken = grid[sandx, sandy]
-            grid[sandx, sandy] = True
+            taken = cells[sand]
+            cells[sand] = True
             return not taken
+        sandy += 1
     return False
 
 
-def fill_grid(grid: Dict[Coord, bool]):
+def fill_grid(grid: Grid):
     added_sand = 0
-    lowest = max((y for _, y in grid.keys()))
+    lowest = get_lowest(grid)
     while True:
         if add_sand(grid, lowest):
             added_sand += 1
@@ -81,17 +97,27 @@ def fill_grid(grid: Dict[Coord, bool]):
     return added_sand
 
 
+def parse(the_input: str) -> List[List[Coord]]:
+    return parse_input(the_input)
+
+
+def part1(regos: List[List[Coord]]):
+    return fill_grid(get_initial_grid(regos))
+
+
+def part2(regos: List[List[Coord]]):
+    return fill_grid(get_pt2_grid(regos))
+
+
 def main():
     test_input = '''498,4 -> 498,6 -> 496,6
 503,4 -> 502,4 -> 502,9 -> 494,9
 '''
-    with open('input/day14_input.txt') as f:
-        file_input = f.read()
+    file_input = read_input(input_source(14))
     the_input = file_input
-    parsed = parse_input(the_input)
-    grid = get_initial_grid(parsed)
-    print(fill_grid(grid))
-    print(fill_grid(get_pt2_grid(parsed)))
+    parsed = parse(the_input)
+    print(part1(parsed))
+    print(part2(parsed))
 
 
 if __name__ == '__main__':
@@ -1,29 +1,35 @@
 from typing import Tuple, List, Set
+from functools import cache
 
-from parsy import string, decimal_digit, seq
 from attrs import define, Factory
 
+from coords import Coord
+from loader import extract_ints, input_source, read_input
 
-Coord = Tuple[int, int]
 
-number = seq(
-    string('-').at_most(1).map(
-        lambda s: -1 if s else 1
-    ),
-    decimal_digit.at_least(1).concat().map(int)
-).combine(lambda s, n: s * n)
+@cache
+def sensor_parse():
+    # the original parsy grammar, kept as the reference for the parse benchmark
+    from parsy import string, decimal_digit, seq
 
-coord = seq(
-    string('x=') >> number,
-    string(', y=') >> number
-).map(tuple)
+    number = seq(
+        string('-').at_most(1).map(
+            lambda s: -1 if s else 1
+        ),
+        decimal_digit.at_least(1).concat().map(int)
+    ).combine(lambda s, n: s * n)
 
-sensor_line = seq(
-    string('Sensor at ') >> coord,
-    string(': closest beacon is at ') >> coord << string('\n')
-).map(tuple)
+    coord = seq(
+        string('x=') >> number,
+        string(', y=') >> number
+    ).map(tuple)
 
-sensor_parse = sensor_line.many()
+    sensor_line = seq(
+        string('Sensor at ') >> coord,
+        string(': closest beacon is at ') >> coord << string('\n')
+    ).map(tuple)
+
+    return sensor_line.many()
 
 
 def get_exclusion_in(sensor: Coord, beacon: Coord, y: int) -> Tuple[int, int]:
@@ -153,7 +159,33 @@ def find_beacon(conns: List[Tuple[Coord, Coord]], lb: int, ub: int):
             print(row)
         if len(compl) > 0:
             print(f'y={row}', excluded, compl)
-            break
+            return compl.ranges[0][0], row
+
+
+def parse_sensors(the_input: str) -> List[Tuple[Coord, Coord]]:
+    # 'Sensor at x=<x>, y=<y>: closest beacon is at x=<x>, y=<y>', four signed numbers per line
+    numbers = extract_ints(the_input)
+    return [
+        ((numbers[i], numbers[i + 1]), (numbers[i + 2], numbers[i + 3]))
+        for i in range(0, len(numbers), 4)
+    ]
+
+
+def parse_sensors_parsy(the_input: str) -> List[Tuple[Coord, Coord]]:
+    return sensor_parse().parse(the_input)
+
+
+def parse(the_input: str) -> List[Tuple[Coord, Coord]]:
+    return parse_sensors(the_input)
+
+
+def part1(sensors: List[Tuple[Coord, Coord]], the_row=2000000):
+    return len(get_exclusion_ranges_in(sensors, the_row))
+
+
+def part2(sensors: List[Tuple[Coord, Coord]], the_bound=4000000):
+    x, y = find_beacon(sensors, 0, the_bound)
+    return x * 4000000 + y
 
 
 def main():
@@ -172,8 +204,7 @@ Sensor at x=16, y=7: closest beacon is at x=15, y=3
 Sensor at x=14, y=3: closest beacon is at x=15, y=3
 Sensor at x=20, y=1: closest beacon is at x=15, y=3
 '''
-    with open('input/day15_input.txt') as f:
-        file_input = f.read()
+    file_input = read_input(input_source(15))
     TEST = False
     if TEST:
         the_input = test_input
@@ -183,10 +214,9 @@ Sensor at x=20, y=1: closest beacon is at x=15, y=3
         the_input = file_input
         the_row = 2000000
         the_bound = 4000000
-    sensors = sensor_parse.parse(the_input)
-    result_range = get_exclusion_ranges_in(sensors, the_row)
-    print(len(result_range))
-    find_beacon(sensors, 0, the_bound)
+    sensors = parse(the_input)
+    print(part1(sensors, the_row))
+    print(part2(sensors, the_bound))
 
 
 if __name__ == '__main__':
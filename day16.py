@@ -1,6 +1,8 @@
-from parsy import seq, string, decimal_digit, letter
+from functools import cache
+import re
 
-from day12 import dijkstra
+from graph import bfs
+from loader import input_source, read_input
 
 
 test_input = '''Valve AA has flow rate=0; tunnels lead to valves DD, II, BB
@@ -16,19 +18,24 @@ Valve JJ has flow rate=21; tunnel leads to valve II
 '''
 
 
-valve_name = letter.times(2, 2).concat()
-valve_names = seq(
-    valve_name,
-    (string(', ') >> valve_name).many()
-).combine(lambda h, tl: [h] + tl)
+@cache
+def input_parser():
+    # the original parsy grammar, kept as the reference for the parse benchmark
+    from parsy import seq, string, decimal_digit, letter
 
-conn_line = seq(
-    string('Valve ') >> valve_name,
-    string(' has flow rate=') >> decimal_digit.at_least(1).concat().map(int),
-    string('; tunnel') >> (string('s lead to valves ') | string(' leads to valve ')) >> valve_names << string('\n')
-).combine(lambda name, flow, conns: (name, (flow, conns)))
+    valve_name = letter.times(2, 2).concat()
+    valve_names = seq(
+        valve_name,
+        (string(', ') >> valve_name).many()
+    ).combine(lambda h, tl: [h] + tl)
 
-input_parser = conn_line.many().map(dict)
+    conn_line = seq(
+        string('Valve ') >> valve_name,
+        string(' has flow rate=') >> decimal_digit.at_least(1).concat().map(int),
+        string('; tunnel') >> (string('s lead to valves ') | string(' leads to valve ')) >> valve_names << string('\n')
+    ).combine(lambda name, flow, conns: (name, (flow, conns)))
+
+    return conn_line.many().map(dict)
 
 
 def pt1_base_case(valve_dict, action_valves, to_beat=0):
@@ -57,7 +64,7 @@ def most_released_pressure(valve_dict, minutes, action_valves, cur_valve, to_bea
     if to_beat > most_pressure:
         most_pressure = to_beat
         best_valve = None
-    dists = dijkstra({valve: conns for valve, (_, conns) in valve_dict.items()}, cur_valve)
+    dists = bfs([cur_valve], lambda valve: valve_dict[valve][1]).dists
     for i, v in enumerate(action_valves.copy()):  # copy since we are mutating action_valves below
         dist = dists[v]
         if dist < minutes:
@@ -116,11 +123,36 @@ def calc_best_pt2(valve_dict):
                                   base=pt2_base_case, estimator=max_estimator_pt2)
 
 
+VALVE_PATTERN = r'Valve (\w\w) has flow rate=(\d+); tunnels? leads? to valves? ([^\n]*)'
+
+
+def parse_valves(the_input):
+    return {
+        name: (int(flow), conns.split(', '))
+        for name, flow, conns in re.findall(VALVE_PATTERN, the_input)
+    }
+
+
+def parse_valves_parsy(the_input):
+    return input_parser().parse(the_input)
+
+
+def parse(the_input):
+    return parse_valves(the_input)
+
+
+def part1(valve_dict):
+    return calc_best(valve_dict)[0]
+
+
+def part2(valve_dict):
+    return calc_best_pt2(valve_dict)[0]
+
+
 def main():
-    with open('input/day16_input.txt') as f:
-        file_input = f.read()
+    file_input = read_input(input_source(16))
     the_input = file_input
-    parsed = input_parser.parse(the_input)
+    parsed = parse(the_input)
     # print(calc_best(parsed))
     print(calc_best_pt2(parsed))
     # print(max_estimator_pt2(parsed, ['BB', 'CC', 'DD', 'HH', 'EE'], 23))
@@ -2,45 +2,53 @@ from typing import Tuple, Set, Generator, List
 
 from attrs import define
 
+from coords import Coord, Packing
+from loader import input_source, read_input
 
-Coord = Tuple[int, int]
+
+# the stack holds packed (x, y) ints: x is the height, growing towards negative, and y the column, 0 to 6.
+# x is unbounded, a row takes 8 columns so a packed point divides back into its row with >> 3
+STACK = Packing([None, 8])
 
 
 @define
 class Rock:
     overlay: Set[Coord]
+    cells: List[int]  # the overlay packed into offsets
+    min_y: int
+    max_y: int
+    max_x: int
+
+    def as_filled(self, dx: int, dy: int) -> Set[int]:
+        base = STACK.pack((dx, dy))
+        return {base + cell for cell in self.cells}
+
+    def overlaps(self, filled: Set[int], dx: int, dy: int):
+        if dy + self.min_y < 0 or dy + self.max_y >= 7 or dx + self.max_x >= 0:
+            return True
+        base = STACK.pack((dx, dy))
+        return any((base + cell in filled for cell in self.cells))
 
-    def as_filled(self, dx: int, dy: int):
-        return {
-            (cx + dx, cy + dy)
-            for cx, cy in self.overlay
-        }
 
-    def overlaps(self, filled: Set[Coord], dx: int, dy: int):
-        for cx, cy in self.as_filled(dx, dy):
-            if (cx, cy) in filled:
-                return True
-            if cy < 0 or cy >= 7:
-                return True
-            if cx >= 0:
-                return True
-        return False
+def make_rock(overlay: Set[Coord]) -> Rock:
+    return Rock(overlay, STACK.offsets(sorted(overlay)), min((y for _, y in overlay)), max((y for _, y in overlay)),
+                max((x for x, _ in overlay)))
 
 
 rocks = [  # (0,0) is left-bottom
-    Rock({(0, 0), (0, 1), (0, 2), (0, 3)}),  # --
-    Rock({(-1, 0), (-1, 1), (-1, 2), (-2, 1), (0, 1)}),  # +
-    Rock({(0, 0), (0, 1), (0, 2), (-1, 2), (-2, 2)}),  # _|
-    Rock({(-3, 0), (-2, 0), (-1, 0), (0, 0)}),  # |
-    Rock({(-1, 0), (-1, 1), (0, 0), (0, 1)}),  # ⊠
+    make_rock({(0, 0), (0, 1), (0, 2), (0, 3)}),  # --
+    make_rock({(-1, 0), (-1, 1), (-1, 2), (-2, 1), (0, 1)}),  # +
+    make_rock({(0, 0), (0, 1), (0, 2), (-1, 2), (-2, 2)}),  # _|
+    make_rock({(-3, 0), (-2, 0), (-1, 0), (0, 0)}),  # |
+    make_rock({(-1, 0), (-1, 1), (0, 0), (0, 1)}),  # ⊠
 ]
 
 
-def get_highest(filled: Set[Coord]):
-    return min((x for x, y in filled) if filled else [0])
+def get_highest(filled: Set[int]):
+    return min(filled) >> 3 if filled else 0
 
 
-def add_rock(jets: Generator[int, None, None], rock: Rock, filled: Set[Coord]):
+def add_rock(jets: Generator[int, None, None], rock: Rock, filled: Set[int]):
     highest = get_highest(filled)
     dx = highest - 4
     dy = 2
@@ -55,9 +63,9 @@ def add_rock(jets: Generator[int, None, None], rock: Rock, filled: Set[Coord]):
     return dx
 
 
-def has_tetris_at(stack: Set[Coord], x: int):
+def has_tetris_at(stack: Set[int], x: int):
     return all((
-            (x, y) in stack
+            STACK.pack((x, y)) in stack
             for y in range(7)
         ))
 
@@ -66,22 +74,24 @@ def read_jet_rep(jets: Generator[int, None, None], jet_len: int):
     return tuple([next(jets) for _ in range(jet_len)])
 
 
-def gen_tetris_hash(stack: Set[Coord], rock, jets: Generator[int, None, None], jet_len: int):
+def gen_tetris_hash(stack: Set[int], rock, jets: Generator[int, None, None], jet_len: int):
     cur_jet = read_jet_rep(jets, jet_len)
-    min_height = max((x for x, _ in stack)) if stack else 0
+    min_height = max(stack) >> 3 if stack else 0
+    shift = STACK.offset((min_height, 0))
     return hash((frozenset({
-        (x - min_height, y)
-        for x, y in stack
+        packed - shift
+        for packed in stack
     }), rock % 5, cur_jet))
 
 
-def gen_bounded_hash(stack: Set[Coord], rock, jets: Generator[int, None, None], jet_len: int, bound: int):
+def gen_bounded_hash(stack: Set[int], rock, jets: Generator[int, None, None], jet_len: int, bound: int):
     cur_jet = read_jet_rep(jets, jet_len)
     max_height = get_highest(stack)
+    shift = STACK.offset((max_height, 0))
     return hash((frozenset({
-        (x - max_height, y)
-        for x, y in stack
-        if abs(x - max_height) <= bound
+        packed - shift
+        for packed in stack
+        if abs((packed >> 3) - max_height) <= bound
     }), rock % 5, cur_jet))
 
 
@@ -124,9 +134,9 @@ def drop_rocks(jet_str: str, amt: int, repetition_size_bound=None):
         for maybe_tetris in range(destx - 3, destx + 1):
             if has_tetris_at(stack, maybe_tetris):
                 stack = {
-                    (cx, cy)
-                    for cx, cy in stack
-                    if cx <= maybe_tetris
+                    packed
+                    for packed in stack
+                    if packed >> 3 <= maybe_tetris
                 }
                 num_tetris += 1
                 the_hash = gen_tetris_hash(stack, i % 5, jets, jet_rep)
@@ -158,9 +168,10 @@ def drop_rocks(jet_str: str, amt: int, repetition_size_bound=None):
     num_rep = (amt - last_rock - 1) // period
     cur_rock = last_rock + num_rep * period + 1
     print(f'Skipping from {last_rock} to {cur_rock}')
+    shift = STACK.offset((num_rep * height_period, 0))
     stack = {
-        (x + num_rep * height_period, y)
-        for x, y in stack
+        packed + shift
+        for packed in stack
     }
     for i in range(cur_rock, amt):
         add_rock(jets, rocks[i % len(rocks)], stack)
@@ -175,11 +186,11 @@ def input_to_jets(input_str: str) -> Generator[int, None, None]:
         i = i % len(input_str)
 
 
-def stack_to_str(filled: Set[Coord]):
+def stack_to_str(filled: Set[int]):
     result = []
     for i in range(get_highest(filled), 0):
         the_str = '|' + ''.join(
-            '#' if (i, j) in filled else '.'
+            '#' if STACK.pack((i, j)) in filled else '.'
             for j in range(7)
         ) + '|'
         result.append(the_str)
@@ -187,18 +198,28 @@ def stack_to_str(filled: Set[Coord]):
     return '\n'.join(result)
 
 
+def parse(the_input: str) -> str:
+    return the_input.strip()
+
+
+def part1(jet_str: str, amt=2022):
+    return -get_highest(drop_rocks(jet_str, amt))  # the stack grows towards negative x
+
+
+def part2(jet_str: str, amt=1000000000000):
+    return -get_highest(drop_rocks(jet_str, amt))
+
+
 def main():
     test_input = '>>><<><>><<<>><>>><<<>>><<<><<<>><>><<>>\n'
-    with open('input/day17_input.txt') as f:
-        file_input = f.read()
+    file_input = read_input(input_source(17))
     the_input = file_input
 
     pt1 = 2022
     pt2 = 1000000000000
 
-    print(get_highest(drop_rocks(the_input, pt1)))
-    print(get_highest(drop_rocks(the_input, pt2)))
-    pass
+    print(part1(parse(the_input), pt1))
+    print(part2(parse(the_input), pt2))
 
 
 if __name__ == '__main__':
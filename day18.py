@@ -1,9 +1,8 @@
-from typing import Tuple, Set, Dict, List, Generator
+from typing import Set, Generator
 
-from day12 import dijkstra
-
-
-Cube = Tuple[int, int, int]
+from coords import Cube, ORTHOGONAL_STEPS_3D, Packing
+from graph import bfs
+from loader import extract_ints, input_source, read_input
 
 
 small_test = '''1,1,1
@@ -27,23 +26,15 @@ test_input = '''2,2,2
 '''
 
 
-def gen_neighbors(cube: Cube):
-    x, y, z = cube
-    yield x + 1, y, z
-    yield x - 1, y, z
-    yield x, y - 1, z
-    yield x, y + 1, z
-    yield x, y, z - 1
-    yield x, y, z + 1
-
-
-def count_side(cube: Cube, cubes: Set[Cube], interior):
-    return sum((1 for neighbor in gen_neighbors(cube)
-                if neighbor not in cubes and (interior is None or neighbor not in interior)))
-
-
 def count_sides(cubes: Set[Cube], interior=None):
-    return sum((count_side(cube, cubes, interior=interior) for cube in cubes))
+    # packed, so every neighbor is an int addition instead of a new tuple
+    packing = Packing([None, 1 << 20, 1 << 20], [0, 1 << 19, 1 << 19])
+    offsets = packing.offsets(ORTHOGONAL_STEPS_3D)
+    packed = [packing.pack(cube) for cube in cubes]
+    blocked = set(packed)
+    if interior is not None:
+        blocked.update((packing.pack(cube) for cube in interior))
+    return sum((1 for cube in packed for offset in offsets if cube + offset not in blocked))
 
 
 def get_min_bb_cube(cubes: Set[Cube]) -> Cube:
@@ -69,46 +60,42 @@ def bb_iter(cubes: Set[Cube]) -> Generator[Cube, None, None]:
                 yield x, y, z
 
 
-def in_bound(min_cube: Cube, max_cube: Cube, the_cube: Cube) -> bool:
-    minx, miny, minz = min_cube
-    maxx, maxy, maxz = max_cube
-    x, y, z = the_cube
-    return (minx <= x <= maxx and
-            miny <= y <= maxy and
-            minz <= z <= maxz)
-
-
-def gen_graph(cubes: Set[Cube]) -> Dict[Cube, List[Cube]]:
-    conns: Dict[Cube, List[Cube]] = {}
+def find_interior_air(cubes: Set[Cube]) -> Set[Cube]:
     min_cube = get_min_bb_cube(cubes)
     max_cube = get_max_bb_cube(cubes)
-    for cube in bb_iter(cubes):
-        if cube not in cubes:
-            conns[cube] = [
-                neighbor for neighbor in gen_neighbors(cube)
-                if neighbor not in cubes and in_bound(min_cube, max_cube, neighbor)
-            ]
-    return conns
+    # the bounding box plus one layer around it, which stays blocked so the search never leaves the box
+    packing = Packing([hi - lo + 3 for lo, hi in zip(min_cube, max_cube)], [1 - lo for lo in min_cube])
+    offsets = packing.offsets(ORTHOGONAL_STEPS_3D)
+    blocked = bytearray([1]) * packing.volume()
+    box = [packing.pack(cube) for cube in bb_iter(cubes)]
+    for packed in box:
+        blocked[packed] = 0
+    for cube in cubes:
+        blocked[packing.pack(cube)] = 1
+    outside = bfs([packing.pack(min_cube)],
+                  lambda packed: [packed + offset for offset in offsets if not blocked[packed + offset]]).dists
+    return {packing.unpack(packed) for packed in box if packed not in outside}
 
 
-def find_interior_air(cubes: Set[Cube]) -> Set[Cube]:
-    graph = gen_graph(cubes)
-    start = get_min_bb_cube(cubes)
-    dists = dijkstra(graph, start)
-    interior = set(bb_iter(cubes)) - set(dists.keys())
-    return interior
+def parse(the_input: str) -> Set[Cube]:
+    coords = extract_ints(the_input)
+    return set(zip(coords[0::3], coords[1::3], coords[2::3]))
+
+
+def part1(cubes: Set[Cube]):
+    return count_sides(cubes)
+
+
+def part2(cubes: Set[Cube]):
+    return count_sides(cubes, find_interior_air(cubes))
 
 
 def main():
-    with open('input/day18_input.txt') as f:
-        file_input = f.read()
-    the_input = test_input
-    cubes = {
-        tuple(map(int, cube.strip().split(',')))
-        for cube in the_input.splitlines()
-    }
-    print(count_sides(cubes))
-    print(count_sides(cubes, find_interior_air(cubes)))
+    file_input = read_input(input_source(18))
+    the_input = file_input
+    cubes = parse(the_input)
+    print(part1(cubes))
+    print(part2(cubes))
 
 
 if __name__ == '__main__':
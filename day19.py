@@ -1,5 +1,7 @@
 from typing import Tuple, List
 
+from loader import input_source, read_input
+
 Cost = Tuple[int, int, int]
 Robots = List[int]
 
@@ -199,13 +201,24 @@ def prod_of_first_three(blueprints):
     return result
 
 
+def parse(the_input: str) -> List[Blueprint]:
+    return [parse_blueprint(line.strip()) for line in the_input.splitlines()]
+
+
+def part1(blueprints: List[Blueprint]):
+    return total_quality(blueprints)
+
+
+def part2(blueprints: List[Blueprint]):
+    return prod_of_first_three(blueprints)
+
+
 def main():
-    with open('input/day19_input.txt') as f:
-        file_input = f.read()
+    file_input = read_input(input_source(19))
     the_input = file_input
-    blueprints = [parse_blueprint(line.strip()) for line in the_input.splitlines()]
-    print(total_quality(blueprints))
-    print(prod_of_first_three(blueprints))
+    blueprints = parse(the_input)
+    print(part1(blueprints))
+    print(part2(blueprints))
     # print(estimate_v1(11, 0, 0, 0, 7))
     # print(estimate_v2(10, 0, 0, 7, 0, 33, 14, 6))
     # print(estimate_v3(10, 0, 0, 7, 0, 32, 14, 6, 4, 2, 2))
@@ -2,6 +2,8 @@ from typing import List, Optional, Generator, Tuple
 
 from attrs import define
 
+from loader import extract_ints, input_source, read_input
+
 
 test_input = '''1
 2
@@ -188,20 +190,28 @@ def mix_pt2(array: List[int]):
     return clist
 
 
+def parse(the_input: str) -> List[int]:
+    return extract_ints(the_input)
+
+
+def part1(array: List[int]):
+    clist = to_circular_list(array)
+    mix(clist)
+    return get_coord_sum(clist)
+
+
+def part2(array: List[int]):
+    return get_coord_sum(mix_pt2(array))
+
+
 def main():
-    with open('input/day20_input.txt') as f:
-        file_input = f.read()
+    file_input = read_input(input_source(20))
     the_input = file_input
-    array = list(map(int, the_input.splitlines(False)))
+    array = parse(the_input)
     # array = array[0:200]
     # array[-2] = 0
-    clist = to_circular_list(array)
-    mix(clist)
-    print('done mixing')
-    print(get_coord_sum(clist))
-    clist2 = mix_pt2(array)
-    print('done mixing pt2')
-    print(get_coord_sum(clist2))
+    print(part1(array))
+    print(part2(array))
     # this takes about 10 seconds. we'd need a true skiplist for actual efficiency, but screw that
 
 
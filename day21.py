@@ -1,7 +1,10 @@
 from typing import Dict, Any, Optional
+from copy import copy
 
 from attrs import define
 
+from loader import input_source, read_input
+
 
 test_input = '''root: pppw + sjmn
 dbpl: 5
@@ -103,22 +106,61 @@ def to_partial_yell_str(monkeys: Dict[str, Any], monkey: Any):
         raise ValueError(monkey)
 
 
-def main():
-    with open('input/day21_input.txt') as f:
-        file_input = f.read()
-    the_input = file_input
-    monkeys = {line[:4]: parse_monkey(line[5:].strip()) for line in the_input.splitlines()}
-    # print(monkeys['root'].yell(monkeys))
+INVERSE_OPS_LEFT_KNOWN = {  # known op x = target, solved for x
+    '+': lambda k, t: t - k,
+    '-': lambda k, t: k - t,
+    '*': lambda k, t: t // k,
+    '/': lambda k, t: k // t,
+    '=': lambda k, t: k
+}
+
+INVERSE_OPS_RIGHT_KNOWN = {  # x op known = target, solved for x
+    '+': lambda k, t: t - k,
+    '-': lambda k, t: t + k,
+    '*': lambda k, t: t // k,
+    '/': lambda k, t: t * k,
+    '=': lambda k, t: k
+}
+
+
+def solve_for_human(monkeys: Dict[str, Any], monkey: Any, target: Optional[int] = None) -> int:
+    # walk from monkey down to the human, inverting each operation on the way
+    while not isinstance(monkey, Human):
+        left = monkeys[monkey.left_monkey].partial_yell(monkeys)
+        right = monkeys[monkey.right_monkey].partial_yell(monkeys)
+        if isinstance(left, NumberMonkey):
+            target = INVERSE_OPS_LEFT_KNOWN[monkey.op](left.value, target)
+            monkey = monkeys[monkey.right_monkey]
+        else:
+            target = INVERSE_OPS_RIGHT_KNOWN[monkey.op](right.value, target)
+            monkey = monkeys[monkey.left_monkey]
+    return target
+
+
+def parse(the_input: str) -> Dict[str, Any]:
+    return {line[:4]: parse_monkey(line[5:].strip()) for line in the_input.splitlines()}
+
+
+def part1(monkeys: Dict[str, Any]):
+    monkeys = {name: copy(monkey) for name, monkey in monkeys.items()}  # yelling caches results
+    return monkeys['root'].yell(monkeys)
+
+
+def part2(monkeys: Dict[str, Any]):
+    monkeys = {name: copy(monkey) for name, monkey in monkeys.items()}
     monkeys['humn'] = Human('x')
     monkeys['root'].op = '='
-    # monkeys['root'].partial_yell(monkeys)
+    return solve_for_human(monkeys, monkeys['root'])
+
+
+def main():
+    file_input = read_input(input_source(21))
+    the_input = file_input
+    monkeys = parse(the_input)
+    print(part1(monkeys))
     # print(to_partial_yell_str(monkeys, monkeys['root']))
-    # input into wolframalpha
-    # win
-    # x = 3876907167495
-    # to check the result:
-    monkeys['humn'] = NumberMonkey(3876907167495)
-    print(monkeys['root'].yell(monkeys))
+    # input into wolframalpha used to be the way, now we invert the operations ourselves
+    print(part2(monkeys))
 
 
 if __name__ == '__main__':
@@ -1,9 +1,13 @@
 from typing import Tuple, Dict, Optional, List, Set
+from functools import cache
+from math import isqrt
+import re
 
-from parsy import string, decimal_digit, seq
 from attrs import define
 
-Coord = Tuple[int, int]
+from coords import Coord
+from grid import Grid, grid_from_str, make_grid
+from loader import input_source, read_input
 
 
 test_input = '''        ...#
@@ -96,30 +100,28 @@ DIR_STEP_COORDS = {
 }
 
 
+OPEN = 1
+WALL = 2
+TILES = {' ': 0, '.': OPEN, '#': WALL}  # 0 is off the map
+
+
 @define
 class Map:
-    map_dict: Dict[Coord, bool]
-    map_size: int
+    map_grid: Grid  # 1-based coordinates, like the puzzle
 
     def get_step_dest(self, coord: Coord, step_dir: int) -> Optional[Coord]:
         x, y = coord
         dx, dy = DIR_STEP_COORDS[step_dir]
+        grid = self.map_grid
         while True:
-            x = (x + dx - 1) % self.map_size + 1
-            y = (y + dy - 1) % self.map_size + 1
-            if (x, y) in self.map_dict:
-                return (x, y) if self.map_dict[(x, y)] else None
+            x = (x + dx - 1) % grid.rows + 1
+            y = (y + dy - 1) % grid.cols + 1
+            tile = grid.cells[(x - 1) * grid.cols + y - 1]
+            if tile:
+                return (x, y) if tile == OPEN else None
 
     def __str__(self):
-        return '\n'.join((
-            ''.join((
-                ' ' if (i, j) not in self.map_dict else (
-                    '.' if self.map_dict[(i, j)] else '#'
-                )
-                for j in range(self.map_size + 1)
-            ))
-            for i in range(self.map_size + 1)
-        ))
+        return self.map_grid.to_str(' .#')
 
 
 # Prototypical cube layout:
@@ -156,7 +158,7 @@ def get_top_left_dict(side_len):
 
 @define
 class CubeMap:
-    map_dict: Dict[Coord, bool]
+    map_grid: Grid
     side_len: int
     orig_coords: Dict[Coord, Coord]
 
@@ -205,7 +207,7 @@ class CubeMap:
         return get_password(orig_coord, step_dir)
 
     def __str__(self):
-        return str(map_from_dict(self.map_dict))
+        return self.map_grid.to_str(' .#')
 
 
 #                      face      step_dir  face' dir' flip_side_index?
@@ -249,17 +251,12 @@ face_connections: Dict[int, Dict[int, Tuple[int, int, bool]]] = {
 }
 
 
-def map_from_dict(map_dict: Dict[Coord, bool]):
-    return Map(map_dict, max((max(i, j) for i, j in map_dict.keys())))
+def gen_map(map_str: str) -> Map:
+    return Map(grid_from_str(map_str, TILES, row_offset=1, col_offset=1))
 
 
-def gen_map(map_str: str) -> Map:
-    return map_from_dict({
-        (i + 1, j + 1): char == '.'
-        for i, line in enumerate(map_str.splitlines(False))
-        for j, char in enumerate(line)
-        if char != ' '
-    })
+def first_tile(map_grid: Grid) -> Coord:
+    return map_grid.coord(next((idx for idx, tile in enumerate(map_grid.cells) if tile)))
 
 
 def rotate(base: Coord, coord: Coord, rotation: int, side_len: int):
@@ -277,17 +274,17 @@ def rotate(base: Coord, coord: Coord, rotation: int, side_len: int):
         return bx + side_len - dy - 1, by + dx
 
 
-def morph_cube_map(map_dict: Dict[Coord, bool], side_len: int) -> CubeMap:
+def morph_cube_map(map_grid: Grid, side_len: int) -> CubeMap:
     # morph to shape:
     #   4
     #  301
     #   2
     #   5
     top_left_dict = get_top_left_dict(side_len)
-    result = {}
+    result = make_grid(4 * side_len, 3 * side_len, row_offset=1, col_offset=1)
     coord_map = {}
     # initialize faces down from 3
-    face_queue = [(4, next(iter(map_dict.keys())), 0)]
+    face_queue = [(4, first_tile(map_grid), 0)]
     rem_faces = {0, 1, 2, 3, 5}
     while rem_faces or face_queue:
         cur_face, top_left, rotation = face_queue.pop()
@@ -297,13 +294,13 @@ def morph_cube_map(map_dict: Dict[Coord, bool], side_len: int) -> CubeMap:
                 orig_loc = (top_left[0] + i, top_left[1] + j)
                 changed_loc = rotate(top_left, orig_loc, -rotation, side_len)
                 new_loc = (dest_top_left[0] + i, dest_top_left[1] + j)
-                result[new_loc] = map_dict[changed_loc]
+                result[new_loc] = map_grid[changed_loc]
                 coord_map[new_loc] = changed_loc
         for d in range(4):
             d_step = DIR_STEP_COORDS[(d - rotation) % 4]
             new_top_left = (top_left[0] + side_len * d_step[0], top_left[1] + side_len * d_step[1])
             next_face, new_d, flip = face_connections[cur_face][d]
-            if new_top_left in map_dict and next_face in rem_faces:
+            if map_grid.get(new_top_left, 0) and next_face in rem_faces:
                 next_rotation = (new_d - d + rotation) % 4
                 # print(f'Stepping from {cur_face} to {next_face} (which will have rotation {next_rotation})')
                 rem_faces.remove(next_face)
@@ -311,16 +308,30 @@ def morph_cube_map(map_dict: Dict[Coord, bool], side_len: int) -> CubeMap:
     return CubeMap(result, side_len, coord_map)
 
 
-number = decimal_digit.many().concat().map(int)
-direction = string('R').result(1) | string('L').result(-1)
-route_el = seq(direction, number).map(tuple)
-route_parse = route_el.many()
+@cache
+def route_parse():
+    # the original parsy grammar, kept as the reference for the parse benchmark
+    from parsy import string, decimal_digit, seq
+
+    number = decimal_digit.many().concat().map(int)
+    direction = string('R').result(1) | string('L').result(-1)
+    route_el = seq(direction, number).map(tuple)
+    return route_el.many()
+
+
+def parse_route(route: str) -> List[Tuple[int, int]]:
+    # the route starts with a number, an initial right turn makes every step a (turn, amount) pair
+    return [(1 if turn == 'R' else -1, int(amt)) for turn, amt in re.findall(r'([RL])(\d+)', 'R' + route.strip())]
+
+
+def parse_route_parsy(route: str) -> List[Tuple[int, int]]:
+    return route_parse().parse('R' + route.strip())
 
 
 def parse_input(input_str: str):
     map_str, route = tuple(input_str.split('\n\n'))
     map_obj = gen_map(map_str)
-    return map_obj, route_parse.parse('R' + route.strip())
+    return map_obj, parse_route(route)
 
 
 def walk_route_el(map_obj: Map, coord: Coord, facing: int, steps: int, dir_change: int) \
@@ -347,7 +358,7 @@ def walk_cube_route_el(map_obj: CubeMap, coord: Coord, facing: int, steps: int,
     facing = (facing + dir_change) % 4
     for i in range(steps):
         new_coord, new_facing = map_obj.get_step_dest(coord, facing)
-        if not map_obj.map_dict[new_coord]:  # there is a wall there
+        if map_obj.map_grid[new_coord] == WALL:
             break
         coord, facing = new_coord, new_facing
     return coord, facing
@@ -368,27 +379,41 @@ def get_password(coord: Coord, facing: int):
 def test_cube_with(the_test_input):
     the_input, side_len, password = the_test_input
     map_obj, route = parse_input(the_input)
-    cube_map = morph_cube_map(map_obj.map_dict, side_len)
+    cube_map = morph_cube_map(map_obj.map_grid, side_len)
     dest, facing = walk_cube_route(cube_map, route)
     assert(cube_map.get_password(dest, facing) == password)
 
 
+def parse(the_input: str) -> Tuple[Map, List[Tuple[int, int]]]:
+    return parse_input(the_input)
+
+
+def part1(parsed: Tuple[Map, List[Tuple[int, int]]]):
+    return get_password(*walk_route(*parsed))
+
+
+def part2(parsed: Tuple[Map, List[Tuple[int, int]]], side_len=None):
+    map_obj, route = parsed
+    if side_len is None:  # six faces of side_len * side_len tiles
+        side_len = isqrt((len(map_obj.map_grid) - map_obj.map_grid.count(0)) // 6)
+    cube_map = morph_cube_map(map_obj.map_grid, side_len)
+    dest, facing = walk_cube_route(cube_map, route)
+    return cube_map.get_password(dest, facing)
+
+
 def main():
     test_cube_with(test_input3)
     test_cube_with(test_input4)
     test_cube_with(test_input5)
     test_cube_with(test_input)
     test_cube_with(test_input6)
-    with open('input/day22_input.txt') as f:
-        file_input = f.read(), 50
+    file_input = read_input(input_source(22)), 50
     the_input, the_side_len = file_input
-    map_obj, route = parse_input(the_input)
-    print(get_password(*walk_route(map_obj, route)))
-    print(str(map_obj))
-    cube_map = morph_cube_map(map_obj.map_dict, the_side_len)
-    print(str(cube_map))
-    dest, facing = walk_cube_route(cube_map, route)
-    print(cube_map.get_password(dest, facing))
+    parsed = parse(the_input)
+    print(part1(parsed))
+    print(str(parsed[0]))
+    print(str(morph_cube_map(parsed[0].map_grid, the_side_len)))
+    print(part2(parsed, the_side_len))
     # manually correct for facing dest
 
 
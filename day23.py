@@ -2,8 +2,10 @@ from typing import Tuple, Set, List, Dict
 
 from collections import defaultdict
 
+from coords import Coord
+from grid import Grid, make_grid
+from loader import input_source, read_input
 
-Coord = Tuple[int, int]
 
 test_input = '''....#..
 ..###.#
@@ -32,75 +34,97 @@ def parse_input(input_str: str) -> Set[Coord]:
     }
 
 
-def add_step(coord: Coord, step: Coord):
-    x, y = coord
-    i, j = step
-    return x + i, y + j
+DIR_LIST = [
+    [(-1, -1), (-1, 0), (-1, 1)],
+    [(1, -1), (1, 0), (1, 1)],
+    [(-1, -1), (0, -1), (1, -1)],
+    [(-1, 1), (0, 1), (1, 1)],
+]
 
+MARGIN = 16  # free rows and columns kept around the elves, so neighbor lookups never leave the grid
 
-def get_neigbors(coord: Coord):
-    for i in range(-1, 1 + 1):
-        for j in range(-1, 1 + 1):
-            if i == 0 and j == 0:
-                continue
-            yield add_step(coord, (i, j))
 
+class ElfField:
+    # plain and slotted like Grid, attrs would be the slowest import of this day
+    __slots__ = ('grid', 'elfs')
 
-def propose_move(coord: Coord, elfs: Set[Coord], dirs: List[List[Coord]]):
-    present_neighbors = {
-        neighbor for neighbor in get_neigbors(coord)
-        if neighbor in elfs
-    }
-    if not present_neighbors:
-        return coord
-    for dir_neighbors in dirs:
-        if all((add_step(coord, dir_neighbor) not in present_neighbors for dir_neighbor in dir_neighbors)):
-            return add_step(coord, dir_neighbors[1])
+    def __init__(self, grid: Grid, elfs: List[int]):
+        self.grid = grid
+        self.elfs = elfs  # flat indices into grid, which holds a 1 where an elf stands
 
 
-def do_move(elfs: Set[Coord], dirs: List[List[Coord]]):
-    proposed: Dict[Coord, List[Coord]] = defaultdict(lambda: list())
-    dups = []
+def to_elf_field(elfs: Set[Coord]) -> ElfField:
+    mini, maxi, minj, maxj = get_elfs_dimensions(elfs)
+    grid = make_grid(maxi - mini + 1 + 2 * MARGIN, maxj - minj + 1 + 2 * MARGIN,
+                     row_offset=mini - MARGIN, col_offset=minj - MARGIN)
+    elf_idxs = []
     for elf in elfs:
-        dest = propose_move(elf, elfs, dirs)
-        proposed[dest].append(elf)
-        if len(proposed[dest]) > 1 or dest is None:
-            dups.append(dest)
-    return {
-        dest for dest in proposed.keys()
-        if dest not in dups
-    } | {
-        orig for dup in dups
-        for orig in proposed[dup]
-    }
-
-
-DIR_LIST = [
-    [(-1, -1), (-1, 0), (-1, 1)],
-    [(1, -1), (1, 0), (1, 1)],
-    [(-1, -1), (0, -1), (1, -1)],
-    [(-1, 1), (0, 1), (1, 1)],
-]
+        grid[elf] = 1
+        elf_idxs.append(grid.index(*elf))
+    return ElfField(grid, elf_idxs)
+
+
+def from_elf_field(field: ElfField) -> Set[Coord]:
+    return {field.grid.coord(elf) for elf in field.elfs}
+
+
+def needs_regrow(field: ElfField) -> bool:
+    cols = field.grid.cols
+    rows = {elf // cols for elf in field.elfs}
+    columns = {elf % cols for elf in field.elfs}
+    return (min(rows) < 2 or max(rows) >= field.grid.rows - 2 or
+            min(columns) < 2 or max(columns) >= cols - 2)
+
+
+def do_move(field: ElfField, dirs: List[List[Coord]]) -> bool:
+    # moves the elves in place, returns whether any of them moved
+    if needs_regrow(field):
+        new_field = to_elf_field(from_elf_field(field))
+        field.grid, field.elfs = new_field.grid, new_field.elfs
+    grid = field.grid
+    cells = grid.cells
+    neighbor_offsets = [grid.step_offset((i, j)) for i in (-1, 0, 1) for j in (-1, 0, 1) if i or j]
+    dir_offsets = [[grid.step_offset(step) for step in dir_steps] for dir_steps in dirs]
+    proposals = []
+    claims: Dict[int, int] = defaultdict(int)
+    for elf in field.elfs:
+        dest = elf
+        if any((cells[elf + offset] for offset in neighbor_offsets)):
+            for left, mid, right in dir_offsets:
+                if not (cells[elf + left] or cells[elf + mid] or cells[elf + right]):
+                    dest = elf + mid
+                    claims[dest] += 1
+                    break
+        proposals.append(dest)
+    moved = False
+    for i, (elf, dest) in enumerate(zip(field.elfs, proposals)):
+        if dest != elf and claims[dest] == 1:
+            cells[elf] = 0
+            cells[dest] = 1
+            field.elfs[i] = dest
+            moved = True
+    return moved
 
 
 def do_moves(elfs: Set[Coord], amt: int):
+    field = to_elf_field(elfs)
     the_dirs = DIR_LIST.copy()
     for i in range(amt):
-        elfs = do_move(elfs, the_dirs)
+        do_move(field, the_dirs)
         the_dirs = the_dirs[1:] + the_dirs[:1]
-    return elfs
+    return from_elf_field(field)
 
 
 def find_fixpoint(elfs: Set[Coord]):
+    field = to_elf_field(elfs)
     the_dirs = DIR_LIST.copy()
     moves = 0
     while True:
-        new_elfs = do_move(elfs, the_dirs)
+        moved = do_move(field, the_dirs)
         the_dirs = the_dirs[1:] + the_dirs[:1]
         moves += 1
-        if new_elfs == elfs:
+        if not moved:
             return moves
-        elfs = new_elfs
 
 
 def get_elfs_dimensions(elfs: Set[Coord]) -> Tuple[int, int, int, int]:
@@ -134,15 +158,25 @@ def empty_ground_tiles(elfs: Set[Coord]) -> int:
     return (maxi + 1 - mini) * (maxj + 1 - minj) - len(elfs)
 
 
+def parse(the_input: str) -> Set[Coord]:
+    return parse_input(the_input)
+
+
+def part1(elfs: Set[Coord]):
+    return empty_ground_tiles(do_moves(elfs, 10))
+
+
+def part2(elfs: Set[Coord]):
+    # could be made more efficient by keeping track of non-moving elves. but this is okay
+    return find_fixpoint(elfs)
+
+
 def main():
-    with open('input/day23_input.txt') as f:
-        file_input = f.read()
+    file_input = read_input(input_source(23))
     the_input = file_input
-    parsed = parse_input(the_input)
-    after_10 = do_moves(parsed, 10)
-    print(empty_ground_tiles(after_10))
-    # could be made more efficient by keeping track of non-moving elves. but this is okay
-    print(find_fixpoint(parsed))
+    parsed = parse(the_input)
+    print(part1(parsed))
+    print(part2(parsed))
 
 
 if __name__ == '__main__':
@@ -1,8 +1,9 @@
-from typing import Set, Tuple, List, Dict
+from typing import Set, Tuple, List
 
-from day12 import dijkstra
-
-Coord = Tuple[int, int]
+from coords import Coord
+from graph import a_star, unit_weights
+from grid import Grid, grid_from_str
+from loader import input_source, read_input
 
 
 test_input = '''#.######
@@ -14,13 +15,13 @@ test_input = '''#.######
 '''
 
 
-def read_map(input_str: str) -> Set[Coord]:
-    return {
-        (i - 1, j - 1)
-        for i, line in enumerate(input_str.splitlines(False))
-        for j, el in enumerate(line)
-        if el != '#'
-    }
+FREE = 1
+TILES = {'#': 0, '.': FREE, '>': FREE, 'v': FREE, '<': FREE, '^': FREE}
+
+
+def read_map(input_str: str) -> Grid:
+    # offsets put the top left corner inside the walls at (0, 0)
+    return grid_from_str(input_str.strip(), TILES, row_offset=-1, col_offset=-1)
 
 
 DIR_MAP = {
@@ -47,10 +48,8 @@ def read_tornadoes(input_str: str) -> Set[Tuple[Coord, int]]:
     }
 
 
-def get_map_size(the_map: Set[Coord]) -> Tuple[int, int]:
-    xlen = (max((x for x, _ in the_map)) - 1) - (min((x for x, _ in the_map)) + 1) + 1
-    ylen = max((y for _, y in the_map)) - min((y for _, y in the_map)) + 1
-    return xlen, ylen
+def get_map_size(the_map: Grid) -> Tuple[int, int]:
+    return the_map.rows - 2, the_map.cols - 2
 
 
 def get_gcd(a: int, b: int) -> int:
@@ -78,64 +77,75 @@ def tornadoes_step(tornadoes: Set[Tuple[Coord, int]], xlen: int, ylen: int) -> S
     }
 
 
-def gen_map_sequence(the_map: Set[Coord], tornadoes: Set[Tuple[Coord, int]]) -> List[Set[Coord]]:
+def gen_map_sequence(the_map: Grid, tornadoes: Set[Tuple[Coord, int]]) -> List[Grid]:
     xlen, ylen = get_map_size(the_map)
     list_len = get_scm(xlen, ylen)
     result = []
     for i in range(list_len):
-        result.append(the_map - {tornado_coord for tornado_coord, _ in tornadoes})
+        cur_map = the_map.copy()
+        for tornado_coord, _ in tornadoes:
+            cur_map[tornado_coord] = 0
+        result.append(cur_map)
         tornadoes = tornadoes_step(tornadoes, xlen, ylen)
     return result
 
 
-def get_neighbors(coord: Coord) -> List[Coord]:
-    x, y = coord
+def get_moves(map_sequence: List[Grid], node: Tuple[int, int]) -> List[Tuple[int, int]]:
+    # nodes are (time in the sequence, flat index into the map)
+    i, idx = node
+    next_idx = (i + 1) % len(map_sequence)
+    next_cells = map_sequence[next_idx].cells
     return [
-        (x + DIR_STEP_MAP[the_dir][0], y + DIR_STEP_MAP[the_dir][1])
-        for the_dir in range(4)
-    ] + [(x, y)]
-
-
-def to_regular_map(map_sequence: List[Set[Coord]]) -> Dict[Tuple[int, Coord], List[Tuple[int, Coord]]]:
-    result = {}
-    for i, cur_map in enumerate(map_sequence):
-        next_idx = (i + 1) % len(map_sequence)
-        next_map = map_sequence[next_idx]
-        for coord in cur_map:
-            result[i, coord] = [(next_idx, neighbor) for neighbor in get_neighbors(coord) if neighbor in next_map]
-    return result
+        (next_idx, neighbor) for neighbor in map_sequence[i].neighbors(idx) + [idx]
+        if next_cells[neighbor]
+    ]
 
 
-def find_first_at(path_len_dict: Dict[Tuple[int, Coord], int], coord: Coord, map_len: int) -> Tuple[int, int]:
-    shortest = min((
-        path_len_dict[i, coord]
-        for i in range(map_len)
-        if (i, coord) in path_len_dict
-    ))
-    return shortest, (shortest % map_len)
+def manhattan_dist(the_map: Grid, idx: int, other_idx: int) -> int:
+    x, y = the_map.coord(idx)
+    other_x, other_y = the_map.coord(other_idx)
+    return abs(x - other_x) + abs(y - other_y)
 
 
-def find_path_len(the_map: Set[Coord], tornadoes: Set[Tuple[Coord, int]]) -> Tuple[int, int]:
+def find_trip_lens(the_map: Grid, tornadoes: Set[Tuple[Coord, int]], num_trips: int) -> List[int]:
     map_seq = gen_map_sequence(the_map, tornadoes)
-    reg_map = to_regular_map(map_seq)
-    start = (-1, 0)
-    path_len_dict1 = dijkstra(reg_map, (0, start))
+    moves = unit_weights(lambda node: get_moves(map_seq, node))
     xlen, ylen = get_map_size(the_map)
-    dest = (xlen, ylen - 1)
-    pt1, idx = find_first_at(path_len_dict1, dest, len(map_seq))
-    path_len_dict2 = dijkstra(reg_map, (idx, dest))
-    pt2_1, idx1 = find_first_at(path_len_dict2, start, len(map_seq))
-    path_len_dict3 = dijkstra(reg_map, ((idx + idx1)% len(map_seq), start))
-    pt2_2, _ = find_first_at(path_len_dict3, dest, len(map_seq))
-    return pt1, (pt1 + pt2_1 + pt2_2)
+    # trips go back and forth between start and destination
+    ends = [the_map.index(-1, 0), the_map.index(xlen, ylen - 1)]
+    idx = 0
+    result = []
+    for i in range(num_trips):
+        dest = ends[(i + 1) % 2]
+        trip = a_star([(idx, ends[i % 2])], moves, is_target=lambda node: node[1] == dest,
+                      heuristic=lambda node: manhattan_dist(the_map, node[1], dest))
+        trip_len = trip.target_dist()
+        idx = (idx + trip_len) % len(map_seq)
+        result.append(trip_len)
+    return result
+
+
+def find_path_len(the_map: Grid, tornadoes: Set[Tuple[Coord, int]]) -> Tuple[int, int]:
+    trip_lens = find_trip_lens(the_map, tornadoes, 3)
+    return trip_lens[0], sum(trip_lens)
+
+
+def parse(the_input: str) -> Tuple[Grid, Set[Tuple[Coord, int]]]:
+    return read_map(the_input), read_tornadoes(the_input)
+
+
+def part1(parsed: Tuple[Grid, Set[Tuple[Coord, int]]]):
+    return find_trip_lens(*parsed, 1)[0]
+
+
+def part2(parsed: Tuple[Grid, Set[Tuple[Coord, int]]]):
+    return sum(find_trip_lens(*parsed, 3))
 
 
 def main():
-    with open('input/day24_input.txt') as f:
-        file_input = f.read()
+    file_input = read_input(input_source(24))
     the_input = file_input
-    the_map = read_map(the_input)
-    tornadoes = read_tornadoes(the_input)
+    the_map, tornadoes = parse(the_input)
     print(find_path_len(the_map, tornadoes))
 
 
@@ -0,0 +1,140 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+from collections import deque
+from itertools import count
+import heapq
+
+
+A = TypeVar('A')
+
+# graphs are given as callbacks from a node to its neighbors, so they can be computed on the fly
+# instead of being built up front
+Neighbors = Callable[[A], Iterable[A]]
+WeightedNeighbors = Callable[[A], Iterable[Tuple[A, int]]]
+IsTarget = Callable[[A], bool]
+
+
+class SearchResult:
+    # with a target, the search stops at the first target it settles. dists then also holds
+    # (possibly too long) distances of nodes that were seen but not yet settled.
+    # not an attrs class, so the days searching graphs do not pay for importing attrs
+    __slots__ = ('dists', 'target')
+
+    def __init__(self):
+        self.dists: Dict[Any, int] = {}
+        self.target: Optional[Any] = None
+
+    def target_dist(self) -> Optional[int]:
+        return None if self.target is None else self.dists[self.target]
+
+
+def dict_neighbors(graph: Dict[A, List[A]]) -> Neighbors:
+    return lambda node: graph.get(node, ())
+
+
+def unit_weights(neighbors: Neighbors) -> WeightedNeighbors:
+    return lambda node: ((neighbor, 1) for neighbor in neighbors(node))
+
+
+def bfs(starts: Iterable[A], neighbors: Neighbors, is_target: Optional[IsTarget] = None) -> SearchResult:
+    # unit weights only. more than one start gives the distance to the closest of them
+    result = SearchResult()
+    todo = deque()
+    for start in starts:
+        result.dists[start] = 0
+        todo.append(start)
+    while todo:
+        node = todo.popleft()
+        if is_target is not None and is_target(node):
+            result.target = node
+            return result
+        dist = result.dists[node] + 1
+        for neighbor in neighbors(node):
+            if neighbor not in result.dists:
+                result.dists[neighbor] = dist
+                todo.append(neighbor)
+    return result
+
+
+def zero_one_bfs(starts: Iterable[A], neighbors: WeightedNeighbors, is_target: Optional[IsTarget] = None) \
+        -> SearchResult:
+    result = SearchResult()
+    todo = deque()
+    for start in starts:
+        result.dists[start] = 0
+        todo.append((0, start))
+    done = set()
+    while todo:
+        dist, node = todo.popleft()
+        if node in done or dist > result.dists[node]:
+            continue
+        done.add(node)
+        if is_target is not None and is_target(node):
+            result.target = node
+            return result
+        for neighbor, weight in neighbors(node):
+            if weight not in (0, 1):
+                raise ValueError(f'edge weight {weight} from {node} to {neighbor}, only 0 and 1 are allowed')
+            new_dist = dist + weight
+            if neighbor not in result.dists or new_dist < result.dists[neighbor]:
+                result.dists[neighbor] = new_dist
+                if weight == 0:
+                    todo.appendleft((new_dist, neighbor))
+                else:
+                    todo.append((new_dist, neighbor))
+    return result
+
+
+def dijkstra(starts: Iterable[A], neighbors: WeightedNeighbors, is_target: Optional[IsTarget] = None) \
+        -> SearchResult:
+    # weights must not be negative. the counter breaks ties, so nodes themselves never get compared
+    result = SearchResult()
+    tie_breaker = count()
+    todo = []
+    for start in starts:
+        result.dists[start] = 0
+        todo.append((0, next(tie_breaker), start))
+    heapq.heapify(todo)
+    done = set()
+    while todo:
+        dist, _, node = heapq.heappop(todo)
+        if node in done or dist > result.dists[node]:
+            continue
+        done.add(node)
+        if is_target is not None and is_target(node):
+            result.target = node
+            return result
+        for neighbor, weight in neighbors(node):
+            new_dist = dist + weight
+            if neighbor not in result.dists or new_dist < result.dists[neighbor]:
+                result.dists[neighbor] = new_dist
+                heapq.heappush(todo, (new_dist, next(tie_breaker), neighbor))
+    return result
+
+
+def a_star(starts: Iterable[A], neighbors: WeightedNeighbors, is_target: IsTarget,
+           heuristic: Callable[[A], int]) -> SearchResult:
+    # heuristic must never overestimate the distance to the nearest target, and must not drop by more
+    # than the weight of any edge, otherwise the first target found need not be the closest one
+    result = SearchResult()
+    tie_breaker = count()
+    todo = []
+    for start in starts:
+        result.dists[start] = 0
+        todo.append((heuristic(start), next(tie_breaker), start))
+    heapq.heapify(todo)
+    done = set()
+    while todo:
+        _, _, node = heapq.heappop(todo)
+        if node in done:
+            continue
+        done.add(node)
+        if is_target(node):
+            result.target = node
+            return result
+        dist = result.dists[node]
+        for neighbor, weight in neighbors(node):
+            new_dist = dist + weight
+            if neighbor not in result.dists or new_dist < result.dists[neighbor]:
+                result.dists[neighbor] = new_dist
+                heapq.heappush(todo, (new_dist + heuristic(neighbor), next(tie_breaker), neighbor))
+    return result
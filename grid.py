@@ -0,0 +1,124 @@
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from loader import Data, grid_view, split_lines
+
+
+Coord = Tuple[int, int]
+
+ORTHOGONAL_STEPS: List[Coord] = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+DIAGONAL_STEPS: List[Coord] = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+ALL_STEPS: List[Coord] = ORTHOGONAL_STEPS + DIAGONAL_STEPS
+
+UNMAPPED = 255  # marks characters without a cell value while reading, so no cell may hold it
+
+
+class Grid:
+    # rows * cols cells of one byte each, stored row by row. (row, col) lives at flat index
+    # (row - row_offset) * cols + (col - col_offset), so hot loops can step through cells with plain
+    # int arithmetic instead of building a tuple for every lookup.
+    # a plain class instead of attrs: several days need nothing else from attrs, and importing it
+    # would double their startup time
+    __slots__ = ('rows', 'cols', 'cells', 'row_offset', 'col_offset')
+
+    def __init__(self, rows: int, cols: int, cells: bytearray, row_offset: int = 0, col_offset: int = 0):
+        self.rows = rows
+        self.cols = cols
+        self.cells = cells
+        self.row_offset = row_offset
+        self.col_offset = col_offset
+
+    def index(self, row: int, col: int) -> int:
+        return (row - self.row_offset) * self.cols + (col - self.col_offset)
+
+    def coord(self, idx: int) -> Coord:
+        row, col = divmod(idx, self.cols)
+        return row + self.row_offset, col + self.col_offset
+
+    def in_bounds(self, row: int, col: int) -> bool:
+        return 0 <= row - self.row_offset < self.rows and 0 <= col - self.col_offset < self.cols
+
+    def __contains__(self, coord: Coord) -> bool:
+        return self.in_bounds(*coord)
+
+    def __getitem__(self, coord: Coord) -> int:
+        if not self.in_bounds(*coord):
+            raise IndexError(coord)
+        return self.cells[self.index(*coord)]
+
+    def __setitem__(self, coord: Coord, value: int):
+        if not self.in_bounds(*coord):
+            raise IndexError(coord)
+        self.cells[self.index(*coord)] = value
+
+    def get(self, coord: Coord, default: Optional[int] = None) -> Optional[int]:
+        return self.cells[self.index(*coord)] if self.in_bounds(*coord) else default
+
+    def __len__(self):
+        return self.rows * self.cols
+
+    def count(self, value: int) -> int:
+        return self.cells.count(value)
+
+    def step_offset(self, step: Coord) -> int:
+        # the flat index difference of a step. only valid when the step stays inside the grid
+        return step[0] * self.cols + step[1]
+
+    def neighbors(self, idx: int, steps: Sequence[Coord] = ORTHOGONAL_STEPS) -> List[int]:
+        row, col = divmod(idx, self.cols)
+        return [
+            idx + drow * self.cols + dcol
+            for drow, dcol in steps
+            if 0 <= row + drow < self.rows and 0 <= col + dcol < self.cols
+        ]
+
+    def row_cells(self, row: int) -> bytearray:
+        start = (row - self.row_offset) * self.cols
+        return self.cells[start:start + self.cols]
+
+    def indices_of(self, value: int) -> Iterator[int]:
+        idx = self.cells.find(value)
+        while idx != -1:
+            yield idx
+            idx = self.cells.find(value, idx + 1)
+
+    def copy(self) -> 'Grid':
+        return Grid(self.rows, self.cols, bytearray(self.cells), self.row_offset, self.col_offset)
+
+    def to_str(self, chars: str) -> str:
+        # chars[v] is how a cell with value v is drawn
+        table = bytes.maketrans(bytes(range(len(chars))), chars.encode())
+        return '\n'.join((
+            bytes(self.cells[row * self.cols:(row + 1) * self.cols]).translate(table).decode()
+            for row in range(self.rows)
+        ))
+
+
+def make_grid(rows: int, cols: int, fill=0, row_offset=0, col_offset=0) -> Grid:
+    return Grid(rows, cols, bytearray([fill]) * (rows * cols), row_offset, col_offset)
+
+
+def grid_from_str(grid_str: Data, cell_values: Dict[str, int], fill=0, row_offset=0, col_offset=0) -> Grid:
+    # grid_str may also be bytes or a memory mapped input. lines shorter than the longest one are padded
+    # with fill
+    table = bytearray([UNMAPPED]) * 256
+    for char, value in cell_values.items():
+        table[ord(char)] = value
+    try:
+        view = grid_view(grid_str)
+    except ValueError:
+        view = None
+    if view is not None:
+        # rectangular, so the whole block is translated in one go, dropping the line endings
+        rows, cols = view.rows, view.cols
+        cells = bytearray(view.data[:max(rows - 1, 0) * view.stride + cols].tobytes().translate(table, b'\r\n'))
+    else:
+        lines = split_lines(grid_str.encode() if isinstance(grid_str, str) else grid_str)
+        rows, cols = len(lines), max((len(line) for line in lines), default=0)
+        cells = bytearray()
+        for line in lines:
+            cells += line.translate(table)
+            cells += bytearray([fill]) * (cols - len(line))
+    if UNMAPPED in cells:
+        bad_idx = cells.index(UNMAPPED)
+        raise ValueError(f'no cell value for the character at row {bad_idx // cols}, column {bad_idx % cols}')
+    return Grid(rows, cols, cells, row_offset, col_offset)
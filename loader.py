@@ -0,0 +1,137 @@
+from contextlib import contextmanager
+import io
+import mmap
+import os
+import re
+import sys
+
+
+# builtin generics instead of typing: the simple days import nothing but this module, and typing alone
+# would take longer to import than those days take to run.
+# whatever the helpers below accept: the text itself, or its bytes in any buffer (bytes, mmap, memoryview)
+Data = str | bytes | bytearray | mmap.mmap | memoryview
+
+# plain strings, re compiles and caches them on first use instead of at import
+INT_PATTERNS = {
+    (str, True): r'-?\d+',
+    (str, False): r'\d+',
+    (bytes, True): rb'-?\d+',
+    (bytes, False): rb'\d+',
+}
+NEWLINE = rb'\r?\n'
+INPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'input')
+STDIN = '-'
+
+
+def input_source(day: int) -> str:
+    # where the main of a day reads from: the first command line argument, '-' for stdin, or else the day's
+    # file in the input directory next to this module, whatever the working directory is
+    if len(sys.argv) > 1:
+        return sys.argv[1]
+    return os.path.join(INPUT_DIR, f'day{day:02d}_input.txt')
+
+
+def is_stream(source) -> bool:
+    return source == STDIN or hasattr(source, 'read')
+
+
+@contextmanager
+def open_input(source):
+    # a text stream to read source from incrementally: a path, '-' for stdin, or an already open file-like
+    # object. binary streams get decoded as utf-8, so the days only ever see text. only a path gets opened,
+    # and so closed again, here
+    if source == STDIN:
+        yield sys.stdin
+    elif isinstance(source, (io.RawIOBase, io.BufferedIOBase)):
+        text = io.TextIOWrapper(source, encoding='utf-8')
+        try:
+            yield text
+        finally:
+            text.detach()  # leaves source open
+    elif hasattr(source, 'read'):
+        yield source
+    else:
+        with open(source) as f:
+            yield f
+
+
+@contextmanager
+def map_input(path):
+    # yields the contents as a read-only, zero-copy mmap that the os pages in as it gets used. the map is
+    # closed on exit, so views into it must not outlive the with block
+    with open(path, 'rb') as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty files can not be mapped
+            yield b''
+            return
+        with data:
+            yield data
+
+
+def read_input(source) -> str:
+    # all of source at once, as text. the days parse str, so a file is simply read, mapping it would only
+    # add a copy. map_input is for scanning a file in place, like the parallel mode of day 1 does
+    if is_stream(source):
+        with open_input(source) as f:
+            text = f.read()
+        return text if isinstance(text, str) else str(text, 'utf-8')
+    with open(source, encoding='utf-8') as f:
+        return f.read()
+
+
+def extract_ints(data: Data, signed=True) -> list[int]:
+    # every integer in data, in order, in one regex pass. with signed=False a '-' is never part of a number,
+    # which is what inputs like '2-4,6-8' need
+    pattern = INT_PATTERNS[str if isinstance(data, str) else bytes, signed]
+    return list(map(int, re.findall(pattern, data)))
+
+
+def split_lines(data: Data) -> list[str | bytes]:
+    if isinstance(data, (str, bytes, bytearray)):
+        return data.splitlines()
+    return bytes(data).splitlines()
+
+
+def as_view(data: Data) -> memoryview:
+    return memoryview(data.encode() if isinstance(data, str) else data)
+
+
+class GridView:
+    # a rectangular block of text read in place: cell (row, col) is the byte at row * stride + col, where the
+    # stride includes the line ending. cells are the raw byte values. a buffer is viewed as it is, text gets
+    # encoded once. grid_from_str uses it to check the shape and translate all rows in one go
+    __slots__ = ('data', 'rows', 'cols', 'stride')
+
+    def __init__(self, data: memoryview, rows: int, cols: int, stride: int):
+        self.data = data
+        self.rows = rows
+        self.cols = cols
+        self.stride = stride
+
+    def __getitem__(self, coord) -> int:
+        row, col = coord
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            raise IndexError(coord)
+        return self.data[row * self.stride + col]
+
+    def row(self, row: int) -> memoryview:
+        return self.data[row * self.stride:row * self.stride + self.cols]
+
+
+def grid_view(data: Data) -> GridView:
+    # all lines must be equally long and end the same way, trailing empty lines are ignored
+    view = as_view(data)
+    end = len(view)
+    while end and view[end - 1] in b'\r\n':
+        end -= 1
+    first_end = re.search(NEWLINE, view[:end])
+    cols = end if first_end is None else first_end.start()
+    stride = cols if first_end is None else first_end.end()
+    starts = [0] + [match.end() for match in re.finditer(NEWLINE, view[:end])]
+    for i, start in enumerate(starts):
+        if start != i * stride:
+            raise ValueError(f'line {i - 1} is not {cols} cells long')
+    if starts[-1] + cols != end:
+        raise ValueError(f'line {len(starts) - 1} is not {cols} cells long')
+    return GridView(view, len(starts) if cols else 0, cols, stride)